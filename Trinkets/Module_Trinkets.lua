@@ -0,0 +1,233 @@
+-- Renders the trinket tables on the wiki from the data page written by trinket_wiki_format.py
+-- (trinket_data_module.json), producing the same wikitext as the generated *_table.txt files.
+--
+-- Upload this file as Module:Trinkets and trinket_data_module.json as Module:Trinkets/data.json, then use:
+--   {{#invoke:Trinkets|quality|common}}
+--   {{#invoke:Trinkets|sets}}
+
+local p = {}
+
+local DATA_PAGE = 'Module:Trinkets/data.json'
+
+-- Python's round() rounds halves to even
+local function roundHalfEven(value)
+	local floor = math.floor(value)
+	local fraction = value - floor
+	if fraction > 0.5 or (fraction == 0.5 and floor % 2 == 1) then
+		return floor + 1
+	end
+	return floor
+end
+
+local function anchor(name)
+	return mw.ustring.lower((string.gsub(name, ' ', '_')))
+end
+
+local function capitalize(text)
+	return mw.ustring.upper(mw.ustring.sub(text, 1, 1)) .. mw.ustring.lower(mw.ustring.sub(text, 2))
+end
+
+-- Cell attribute for the configured style mode: a class list or the equivalent inline style
+local function attr(settings, inlineStyle, classes)
+	if settings.style_mode == 'classes' then
+		return 'class="' .. classes .. '"'
+	end
+	return 'style="' .. inlineStyle .. '"'
+end
+
+local function styleKey(settings, quality)
+	if settings.quality_styles[quality] then
+		return quality
+	end
+	return 'default'
+end
+
+local function rowStyle(settings, quality, index)
+	local styles = settings.quality_styles[quality] or { 'White', '#F0F0F0' }
+	return styles[index % 2 + 1]
+end
+
+local function tableStart(settings, frame)
+	if settings.style_mode == 'classes' then
+		local styles
+		if frame then
+			styles = frame:extensionTag('templatestyles', '', { src = settings.templatestyles_page })
+		else
+			styles = '<templatestyles src="' .. settings.templatestyles_page .. '" />'
+		end
+		return { styles, '{| class="wikitable tt"' }
+	end
+	return { '{| class="wikitable" style="border-collapse:collapse;"' }
+end
+
+local function headerRow(settings, headers)
+	local headerAttr = attr(settings, 'font-size:' .. settings.column_header_font_size .. '; padding:5px;', 'tt-h')
+	local cells = {}
+	for _, header in ipairs(headers) do
+		table.insert(cells, '! ' .. headerAttr .. " | '''" .. header .. "'''")
+	end
+	return table.concat(cells, ' !! ')
+end
+
+local function atlasIcon(placement, sheet, size, name)
+	-- MediaWiki only accepts whole pixel widths, so scale by the rounded sheet width
+	local sheetWidth = math.max(1, roundHalfEven(sheet.width * size / placement.w))
+	local scale = sheetWidth / sheet.width
+	return string.format('<span style="display:inline-block; width:%dpx; height:%dpx; overflow:hidden; vertical-align:middle;">', size, size)
+		.. string.format('<span style="display:block; margin-left:-%gpx; margin-top:-%gpx;">', placement.x * scale, placement.y * scale)
+		.. string.format('[[File:%s|%dpx|link=|alt=%s]]', sheet.file, sheetWidth, name)
+		.. '</span></span>'
+end
+
+local function formatIcon(data, item, size)
+	local atlas = data.atlas
+	local placement = atlas and item.id and atlas.icons[item.id]
+	if placement then
+		return atlasIcon(placement, atlas.sheets[placement.sheet + 1], size, item.name or '')
+	end
+
+	local icon = item.icon or ''
+	if icon ~= '' then
+		icon = string.sub(icon, 1, -3) .. string.format('|%dpx]]', size)
+	end
+	return icon
+end
+
+function p.renderQualityTable(data, quality, frame)
+	local settings = data.settings
+	local out = tableStart(settings, frame)
+	local titleAttr = attr(settings, 'font-size:' .. settings.main_header_font_size .. '; padding:8px;', 'tt-title')
+	table.insert(out, '! colspan="7" ' .. titleAttr .. ' | List of ' .. capitalize(quality) .. ' Trinkets')
+	table.insert(out, '|-')
+	table.insert(out, '')
+	table.insert(out, headerRow(settings, { 'Icon', 'Name', 'Base Description', 'Attuned Description', 'Price', 'Set Item', 'Item Set Name' }))
+
+	local padding = settings.cell_padding
+	local index = 0
+	for _, trinket in ipairs(data.trinkets) do
+		if trinket.quality == quality then
+			local style = rowStyle(settings, quality, index)
+			local nameColor = settings.name_colors[quality] or 'black'
+			local rowClass = 'tt-' .. styleKey(settings, quality) .. '-' .. (index % 2)
+
+			local attuned = trinket.attuned
+			if attuned == nil then
+				attuned = '<i ' .. attr(settings, 'color:' .. (settings.no_attunement_colors[style] or style) .. ';', 'tt-na') .. '>No Attunement</i>'
+			end
+			local setName = trinket.set or ''
+			if setName ~= '' then
+				setName = '[[#' .. anchor(setName) .. '|' .. setName .. ']]'
+			end
+
+			local cellStyle = 'text-align:center; background-color:' .. style .. '; padding:' .. padding .. '; font-size:'
+			table.insert(out, '|-')
+			table.insert(out, '')
+			table.insert(out, '| ' .. attr(settings, 'text-align:center; padding:' .. settings.icon_padding .. ';', 'tt-i')
+				.. ' | ' .. formatIcon(data, trinket, settings.icon_size))
+			table.insert(out, '| ' .. attr(settings, 'text-align:center; background-color:' .. style .. '; color:' .. nameColor .. '; padding:' .. padding .. '; font-size:' .. settings.name_font_size .. ';',
+				'tt-n ' .. rowClass .. ' tt-nc-' .. styleKey(settings, quality))
+				.. ' | <span id="' .. anchor(trinket.name) .. '">' .. trinket.name .. '</span>')
+			table.insert(out, '| ' .. attr(settings, cellStyle .. settings.desc_font_size .. ';', 'tt-d ' .. rowClass) .. ' | ' .. trinket.base)
+			table.insert(out, '| ' .. attr(settings, cellStyle .. settings.desc_font_size .. ';', 'tt-d ' .. rowClass) .. ' | ' .. attuned)
+			table.insert(out, '| ' .. attr(settings, cellStyle .. settings.cell_font_size .. ';', 'tt-c ' .. rowClass) .. ' | ' .. trinket.price)
+			table.insert(out, '| ' .. attr(settings, cellStyle .. settings.cell_font_size .. ';', 'tt-c ' .. rowClass) .. ' | ' .. (trinket.set_item and '✔' or ''))
+			table.insert(out, '| ' .. attr(settings, 'background-color:' .. style .. '; padding:' .. padding .. '; font-size:' .. settings.cell_font_size .. ';', 'tt-l ' .. rowClass)
+				.. ' | ' .. setName)
+			table.insert(out, '')
+			index = index + 1
+		end
+	end
+
+	table.insert(out, '|}')
+	table.insert(out, '')
+	return table.concat(out, '\n')
+end
+
+local function formatSetItems(data, items)
+	local settings = data.settings
+	local formatted = {}
+	for _, item in ipairs(items) do
+		local color = settings.name_colors[item.quality] or '#bababa'
+		-- Unknown qualities fall back to the common color here
+		local colorKey = settings.name_colors[item.quality] and item.quality or 'common'
+		table.insert(formatted, formatIcon(data, item, settings.inline_icon_size)
+			.. ' <span ' .. attr(settings, 'color:' .. color .. '; vertical-align:middle;', 'tt-nc-' .. colorKey .. ' tt-m') .. '>'
+			.. '[[#' .. anchor(item.name) .. '|' .. item.name .. ']]</span>')
+	end
+	return table.concat(formatted, '<br>')
+end
+
+local function getSetIcons(data, items)
+	local icons = {}
+	for _, item in ipairs(items) do
+		if item.id ~= '' then
+			local icon = formatIcon(data, item, data.settings.set_icon_size)
+			if icon ~= '' then
+				table.insert(icons, icon)
+			end
+		end
+	end
+	return table.concat(icons, ' ')
+end
+
+local function formatSetEffects(settings, effects)
+	if effects == nil then
+		return ''
+	end
+	local rows = {}
+	for _, effect in ipairs(effects) do
+		table.insert(rows, '<div ' .. attr(settings, 'display:flex; width:100%; margin:2px 0;', 'tt-er') .. '>'
+			.. '<div ' .. attr(settings, 'width:80px; text-align:right; font-weight:bold; padding-right:5px;', 'tt-ek') .. '>' .. effect[1] .. ' items:</div>'
+			.. '<div ' .. attr(settings, 'flex:1; text-align:left; padding-left:5px;', 'tt-ev') .. '>' .. effect[2] .. '</div>'
+			.. '</div>')
+	end
+	return '<div ' .. attr(settings, 'width:100%;', 'tt-e') .. '>' .. table.concat(rows) .. '</div>'
+end
+
+function p.renderSetsTable(data, frame)
+	local settings = data.settings
+	local out = tableStart(settings, frame)
+	local titleAttr = attr(settings, 'font-size:' .. settings.main_header_font_size .. '; padding:8px;', 'tt-title')
+	table.insert(out, '! colspan="4" ' .. titleAttr .. ' | Trinket Sets')
+	table.insert(out, '|-')
+	table.insert(out, '')
+	table.insert(out, headerRow(settings, { 'Set Name', 'Items in Set', 'Set Items', 'Set Effects' }))
+
+	local padding = settings.cell_padding
+	local index = 0
+	for _, set in ipairs(data.sets) do
+		local style = settings.quality_styles.common[index % 2 + 1]
+		local rowClass = 'tt-common-' .. (index % 2)
+		local setNameCell = '<span id="' .. anchor(set.name) .. '">' .. set.name .. '</span><br><br>' .. getSetIcons(data, set.items)
+
+		table.insert(out, '|-')
+		table.insert(out, '')
+		table.insert(out, '| ' .. attr(settings, 'text-align:center; background-color:' .. style .. '; padding:' .. padding .. '; font-size:' .. settings.set_name_font_size .. ';', 'tt-s ' .. rowClass)
+			.. ' | ' .. setNameCell)
+		table.insert(out, '| ' .. attr(settings, 'text-align:center; background-color:' .. style .. '; padding:' .. padding .. '; font-size:' .. settings.cell_font_size .. ';', 'tt-c ' .. rowClass)
+			.. ' | ' .. set.count)
+		table.insert(out, '| ' .. attr(settings, 'background-color:' .. style .. '; padding:' .. padding .. '; font-size:' .. settings.name_font_size .. ';', 'tt-si ' .. rowClass)
+			.. ' | ' .. formatSetItems(data, set.items))
+		table.insert(out, '| ' .. attr(settings, 'background-color:' .. style .. '; padding:' .. padding .. '; font-size:' .. settings.desc_font_size .. ';', 'tt-se ' .. rowClass)
+			.. ' | ' .. formatSetEffects(settings, set.effects))
+		table.insert(out, '')
+		index = index + 1
+	end
+
+	table.insert(out, '|}')
+	table.insert(out, '')
+	return table.concat(out, '\n')
+end
+
+-- {{#invoke:Trinkets|quality|<quality>}}
+function p.quality(frame)
+	local quality = mw.ustring.lower(mw.text.trim(frame.args[1] or 'common'))
+	return p.renderQualityTable(mw.loadJsonData(DATA_PAGE), quality, frame)
+end
+
+-- {{#invoke:Trinkets|sets}}
+function p.sets(frame)
+	return p.renderSetsTable(mw.loadJsonData(DATA_PAGE), frame)
+end
+
+return p
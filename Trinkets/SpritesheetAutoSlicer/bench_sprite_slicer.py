@@ -0,0 +1,204 @@
+import io
+import csv
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+import numpy as np
+from PIL import Image
+from pathlib import Path
+import sprite_slicer
+
+# Configuration variables for easy tuning
+SCALES = {
+    # name: (number of sheets, icons per sheet)
+    "small": (1, 64),
+    "medium": (4, 256),
+    "large": (16, 1024),
+}
+ICON_SIZE = 24  # Default trinket sprite size in pixels
+REPEATS = 3  # Each scale is timed this many times and the fastest run is kept
+REGRESSION_TOLERANCE = 0.20  # Fraction a phase may be slower than the baseline before it counts as a regression
+PHASES = ["parse", "decode", "check", "crop", "encode", "write", "other"]
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BASELINE_PATH = SCRIPT_DIR / "bench_baseline.json"
+
+def generate_sheet(path, icon_count, rng):
+    """Write a synthetic spritesheet with icon_count noisy, partly transparent icons"""
+    columns = int(np.ceil(np.sqrt(icon_count)))
+    rows = int(np.ceil(icon_count / columns))
+    pixels = rng.integers(0, 256, size=(rows * ICON_SIZE, columns * ICON_SIZE, 4), dtype=np.uint8)
+    # Fully transparent border like real icons have
+    mask = np.zeros((ICON_SIZE, ICON_SIZE), dtype=bool)
+    mask[2:-2, 2:-2] = True
+    pixels[..., 3] = np.where(np.tile(mask, (rows, columns)), pixels[..., 3] | 0x80, 0)
+    Image.fromarray(pixels, "RGBA").save(path)
+
+    coordinates = []
+    for index in range(icon_count):
+        row, column = divmod(index, columns)
+        coordinates.append((column * ICON_SIZE, row * ICON_SIZE, ICON_SIZE, ICON_SIZE))
+    return coordinates
+
+def generate_inputs(work_dir, sheet_count, icons_per_sheet, seed=0):
+    """Write synthetic spritesheets and a matching trinket_data.csv, returning the CSV path"""
+    rng = np.random.default_rng(seed)
+    csv_path = work_dir / "trinket_data.csv"
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=["id", "spritesheet", "coordinates"])
+        writer.writeheader()
+        for sheet_index in range(sheet_count):
+            sheet_name = f"sheet_{sheet_index}.png"
+            for icon_index, coords in enumerate(generate_sheet(work_dir / sheet_name, icons_per_sheet, rng)):
+                writer.writerow({
+                    "id": f"bench_{sheet_index}_{icon_index}",
+                    "spritesheet": sheet_name,
+                    "coordinates": " ".join(str(v) for v in coords)
+                })
+    return csv_path
+
+@contextlib.contextmanager
+def timed_engine_calls(timings):
+    """Time the sprite_engine calls sprite_slicer makes, by phase, while still running the real functions"""
+    phases = {
+        "load_sheet": "decode",
+        "validate_coordinates": "check",
+        "find_transparent_crops": "check",
+        "crop_view": "crop",
+        "save_view": "encode"
+    }
+    originals = {name: getattr(sprite_slicer, name) for name in phases}
+
+    def timed(name):
+        function = originals[name]
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timings[phases[name]] += time.perf_counter() - start
+        return wrapper
+
+    encode = timed("save_view")
+    def save_view(view, output_path, **save_args):
+        # The real save_view encodes into memory, so encoding and writing the file are timed apart
+        buffer = io.BytesIO()
+        encode(view, buffer, format="PNG", **save_args)
+        start = time.perf_counter()
+        Path(output_path).write_bytes(buffer.getvalue())
+        timings["write"] += time.perf_counter() - start
+
+    for name in phases:
+        setattr(sprite_slicer, name, timed(name))
+    sprite_slicer.save_view = save_view
+    try:
+        yield
+    finally:
+        for name, function in originals.items():
+            setattr(sprite_slicer, name, function)
+
+def run_once(work_dir, csv_path):
+    """Slice every icon once through sprite_slicer.slice_items, timing each phase separately"""
+    timings = dict.fromkeys(PHASES, 0.0)
+    output_dir = work_dir / "output"
+    sprite_slicer.clear_sheet_cache()  # Every run decodes its sheets, like a fresh slicer run
+
+    start = time.perf_counter()
+    items = sprite_slicer.read_trinket_data(csv_path)
+    timings["parse"] = time.perf_counter() - start
+
+    # The slicer prints a line per icon; keep the benchmark output readable
+    with timed_engine_calls(timings), contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        sprite_slicer.slice_items(items, output_dir, asset_root=work_dir)
+        total = time.perf_counter() - start
+    # Path resolution and the per-icon bookkeeping
+    timings["other"] = max(0.0, total - sum(timings[phase] for phase in PHASES if phase not in ("parse", "other")))
+
+    return timings, len(items)
+
+def run_benchmarks(scales, repeats=REPEATS):
+    """Time every scale, keeping the fastest of `repeats` runs per phase"""
+    results = {}
+    for name in scales:
+        sheet_count, icons_per_sheet = SCALES[name]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            work_dir = Path(temp_dir)
+            csv_path = generate_inputs(work_dir, sheet_count, icons_per_sheet)
+            best = None
+            for _ in range(repeats):
+                timings, icon_count = run_once(work_dir, csv_path)
+                best = timings if best is None else {phase: min(best[phase], timings[phase]) for phase in PHASES}
+
+        total = sum(best.values())
+        results[name] = {
+            "sheets": sheet_count,
+            "icons": icon_count,
+            "phases": {phase: round(seconds, 6) for phase, seconds in best.items()},
+            "total": round(total, 6),
+            "icons_per_second": round(icon_count / total, 1) if total else None
+        }
+        phase_text = ", ".join(f"{phase} {seconds * 1000:.1f}ms" for phase, seconds in best.items())
+        print(f"{name}: {icon_count} icons on {sheet_count} sheet(s) in {total * 1000:.1f}ms "
+              f"({results[name]['icons_per_second']} icons/s) - {phase_text}")
+    return results
+
+def compare_to_baseline(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    """Print the change against the baseline for every phase and return the regressions found"""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name}: no baseline")
+            continue
+        for phase in PHASES + ["total"]:
+            current = result["total"] if phase == "total" else result["phases"][phase]
+            previous = baseline[name]["total"] if phase == "total" else baseline[name]["phases"].get(phase)
+            if not previous:
+                continue
+            change = (current - previous) / previous
+            marker = ""
+            if change > tolerance:
+                marker = "  <-- REGRESSION"
+                regressions.append(f"{name}/{phase}")
+            print(f"{name}/{phase}: {previous * 1000:.1f}ms -> {current * 1000:.1f}ms ({change:+.1%}){marker}")
+    return regressions
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark sprite slicing on synthetic spritesheets.")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=list(SCALES),
+                        help="scales to run (default: all)")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help=f"runs per scale (default: {REPEATS})")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH,
+                        help="baseline results file (default: bench_baseline.json next to this script)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE,
+                        help=f"allowed slowdown per phase before failing (default: {REGRESSION_TOLERANCE})")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    results = run_benchmarks(args.scales, args.repeats)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=1)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline found at {args.baseline}. Run with --save-baseline to create one.")
+        return
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print(f"Regressions in: {', '.join(regressions)}")
+        sys.exit(1)
+    print("No regressions against the baseline.")
+
+if __name__ == "__main__":
+    main()
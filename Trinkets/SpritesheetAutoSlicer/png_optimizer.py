@@ -0,0 +1,84 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+
+# Configuration variables for easy tuning
+PNG_COMPRESS_LEVEL = 9  # zlib compression level (0-9)
+PALETTE_MAX_COLORS = 256  # Largest colour count that can be stored losslessly as a palette
+OPTIMIZE_WORKERS = None  # Number of worker processes (None uses the CPU count)
+
+def to_lossless_palette(img):
+    """Convert an image to palette mode if it has few enough colours, otherwise return None"""
+    rgba = img.convert("RGBA")
+    colors = rgba.getcolors(PALETTE_MAX_COLORS)
+    if colors is None:
+        return None
+
+    # Build an exact palette (no dithering or quantization) with per-entry alpha
+    palette = []
+    alpha = []
+    for _, color in colors:
+        palette.extend(color[:3])
+        alpha.append(color[3])
+
+    # Map every pixel to its palette entry by its RGBA value packed into one big-endian integer
+    keys = np.array([(r << 24) | (g << 16) | (b << 8) | a for _, (r, g, b, a) in colors], dtype=np.uint32)
+    order = np.argsort(keys)
+    packed = np.ascontiguousarray(np.asarray(rgba)).view(">u4")[..., 0]
+    indices = order[np.searchsorted(keys[order], packed)].astype(np.uint8)
+
+    paletted = Image.frombytes("P", rgba.size, indices.tobytes())
+    paletted.putpalette(palette)
+    if any(a != 255 for a in alpha):
+        paletted.info["transparency"] = bytes(alpha)
+    return paletted
+
+def optimize_png(path):
+    """Losslessly re-encode a PNG in place and return (path, original size, new size)"""
+    original_size = os.path.getsize(path)
+    try:
+        with Image.open(path) as img:
+            img.load()
+            mode = "RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB"
+            candidate = to_lossless_palette(img)
+            if candidate is None:
+                candidate = img.convert(mode)
+            # Drop ancillary data (text, time, icc, exif, ...) so it isn't written back out
+            candidate.info = {k: v for k, v in candidate.info.items() if k == "transparency"}
+
+        temp_path = f"{path}.tmp"
+        save_args = {"optimize": True, "compress_level": PNG_COMPRESS_LEVEL}
+        if "transparency" in candidate.info:
+            save_args["transparency"] = candidate.info["transparency"]
+        candidate.save(temp_path, format="PNG", **save_args)
+
+        new_size = os.path.getsize(temp_path)
+        if new_size < original_size:
+            os.replace(temp_path, path)
+        else:
+            os.remove(temp_path)
+            new_size = original_size
+        return path, original_size, new_size
+    except Exception as e:
+        print(f"Error optimizing {path}: {str(e)}")
+        return path, original_size, original_size
+
+def optimize_pngs(paths, workers=OPTIMIZE_WORKERS):
+    """Optimize a batch of PNGs in parallel and report the bytes saved"""
+    paths = [str(path) for path in paths]
+    if not paths:
+        return 0
+
+    total_before = 0
+    total_after = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path, before, after in executor.map(optimize_png, paths):
+            total_before += before
+            total_after += after
+            print(f"Optimized {os.path.basename(path)}: {before} -> {after} bytes ({before - after} saved)")
+
+    saved = total_before - total_after
+    percent = (saved / total_before * 100) if total_before else 0
+    print(f"Optimized {len(paths)} files: {total_before} -> {total_after} bytes ({saved} saved, {percent:.1f}%)")
+    return saved
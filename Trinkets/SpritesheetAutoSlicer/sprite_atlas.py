@@ -0,0 +1,112 @@
+import json
+import argparse
+from PIL import Image
+from pathlib import Path
+from png_optimizer import optimize_pngs
+
+# Configuration variables for easy tuning
+ATLAS_MAX_SIZE = 1024  # Max width/height in pixels of a single atlas sheet
+ATLAS_PADDING = 1  # Transparent pixels between icons so scaled icons don't bleed into each other
+ATLAS_FILE_PREFIX = "trinket_atlas"  # Atlas sheets are named <prefix>_<n>.png
+ATLAS_MAP_FILE = "trinket_atlas_map.json"  # Coordinate map read by trinket_wiki_format.py
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+def load_icons(input_dir):
+    """Load every sliced icon in the input directory, sorted by id for stable output"""
+    icons = []
+    for path in sorted(Path(input_dir).glob("*.png")):
+        try:
+            with Image.open(path) as img:
+                icons.append((path.stem, img.convert("RGBA")))
+        except Exception as e:
+            print(f"Error loading {path}: {str(e)}")
+    return icons
+
+def pack_icons(icons, max_size=ATLAS_MAX_SIZE, padding=ATLAS_PADDING):
+    """Shelf-pack icons into as few sheets as needed, returning (sheet sizes, placements)"""
+    sheets = []
+    placements = {}
+    x = y = shelf_height = sheet_width = sheet_height = 0
+
+    # Tallest first keeps the shelves tight; id keeps the order stable between runs
+    for icon_id, img in sorted(icons, key=lambda icon: (-icon[1].height, icon[0])):
+        w, h = img.size
+        if w > max_size or h > max_size:
+            print(f"Skipping {icon_id}: {w}x{h} does not fit in a {max_size}px atlas")
+            continue
+
+        if x + w > max_size:
+            # Start a new shelf
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+        if y + h > max_size:
+            # Start a new sheet
+            sheets.append((sheet_width, sheet_height))
+            x = y = shelf_height = sheet_width = sheet_height = 0
+
+        placements[icon_id] = {"sheet": len(sheets), "x": x, "y": y, "w": w, "h": h}
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+        sheet_width = max(sheet_width, x - padding)
+        sheet_height = max(sheet_height, y + h)
+
+    if sheet_width and sheet_height:
+        sheets.append((sheet_width, sheet_height))
+    return sheets, placements
+
+def build_atlas(input_dir, output_dir, max_size=ATLAS_MAX_SIZE):
+    """Pack the icons in input_dir into atlas sheets and write them with a coordinate map"""
+    icons = load_icons(input_dir)
+    if not icons:
+        print(f"No icons found in {input_dir}. Please run sprite_slicer.py first.")
+        return []
+
+    sheet_sizes, placements = pack_icons(icons, max_size)
+    images = dict(icons)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    sheet_files = []
+    sheets = [Image.new("RGBA", size, (0, 0, 0, 0)) for size in sheet_sizes]
+    for icon_id, placement in placements.items():
+        sheets[placement["sheet"]].paste(images[icon_id], (placement["x"], placement["y"]))
+    for index, sheet in enumerate(sheets):
+        sheet_path = output_dir / f"{ATLAS_FILE_PREFIX}_{index}.png"
+        sheet.save(sheet_path)
+        sheet_files.append(sheet_path)
+
+    atlas_map = {
+        "sheets": [
+            {"file": path.name, "width": size[0], "height": size[1]}
+            for path, size in zip(sheet_files, sheet_sizes)
+        ],
+        "icons": dict(sorted(placements.items()))
+    }
+    with open(output_dir / ATLAS_MAP_FILE, 'w', encoding='utf-8') as f:
+        json.dump(atlas_map, f, indent=1)
+
+    print(f"Packed {len(placements)} icons into {len(sheet_files)} atlas sheet(s) in {output_dir}")
+    return sheet_files
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Pack sliced trinket icons into atlas sheets with a coordinate map.")
+    parser.add_argument("--input", default=SCRIPT_DIR / "output_sprites",
+                        help="directory of sliced icons (default: output_sprites next to this script)")
+    parser.add_argument("--output", default=SCRIPT_DIR / "output_atlas",
+                        help="directory for the atlas sheets and map (default: output_atlas next to this script)")
+    parser.add_argument("--max-size", type=int, default=ATLAS_MAX_SIZE,
+                        help=f"max width/height of an atlas sheet in pixels (default: {ATLAS_MAX_SIZE})")
+    parser.add_argument("--optimize", action="store_true", help="losslessly shrink the atlas sheets after packing")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    sheet_files = build_atlas(args.input, args.output, args.max_size)
+    if args.optimize:
+        optimize_pngs(sheet_files)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import numpy as np
+from PIL import Image
+
+def load_sheet(spritesheet_path):
+    """Decode a spritesheet once into an (height, width, 4) RGBA array"""
+    with Image.open(spritesheet_path) as img:
+        return np.asarray(img.convert("RGBA"))
+
+def as_coordinate_array(coordinates):
+    """Turn one or many (x, y, w, h) entries into an (n, 4) integer array"""
+    return np.asarray(coordinates, dtype=np.int64).reshape(-1, 4)
+
+def crop_view(sheet, coordinates):
+    """Cut a sprite out of a decoded sheet as a view, without copying any pixels"""
+    x, y, w, h = coordinates
+    return sheet[y:y + h, x:x + w]
+
+def validate_coordinates(sheet, coordinates):
+    """Return a boolean mask of which (x, y, w, h) entries lie fully inside the sheet"""
+    coords = as_coordinate_array(coordinates)
+    height, width = sheet.shape[:2]
+    x, y, w, h = coords.T
+    return (x >= 0) & (y >= 0) & (w > 0) & (h > 0) & (x + w <= width) & (y + h <= height)
+
+def find_transparent_crops(sheet, coordinates):
+    """Return a boolean mask of which in-bounds (x, y, w, h) entries contain no visible pixels"""
+    coords = as_coordinate_array(coordinates)
+    valid = validate_coordinates(sheet, coords)
+
+    # Summed-area table of opaque pixels, so every crop is checked in O(1) with no pixel copies
+    opaque = np.zeros((sheet.shape[0] + 1, sheet.shape[1] + 1), dtype=np.int64)
+    opaque[1:, 1:] = (sheet[..., 3] > 0).cumsum(axis=0).cumsum(axis=1)
+
+    x, y, w, h = np.where(valid[:, None], coords, 0).T
+    visible = opaque[y + h, x + w] - opaque[y, x + w] - opaque[y + h, x] + opaque[y, x]
+    return valid & (visible == 0)
+
+def save_view(view, output_path, **save_args):
+    """Encode an array view as a PNG; this is the only point where pixels are copied"""
+    Image.fromarray(np.ascontiguousarray(view), "RGBA").save(output_path, **save_args)
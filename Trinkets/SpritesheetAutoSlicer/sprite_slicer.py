@@ -1,7 +1,18 @@
 import os
 import csv
-from PIL import Image
+import argparse
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
+from png_optimizer import optimize_pngs
+from sprite_engine import load_sheet, crop_view, validate_coordinates, find_transparent_crops, save_view
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_CSV_PATH = SCRIPT_DIR.parent / "trinket_data.csv"
+DEFAULT_OUTPUT_DIR = SCRIPT_DIR / "output_sprites"  # trinket_data_extractor.py looks for icons here
+
+# Decoded spritesheets by resolved path, so each sheet is only decoded once per run
+_sheet_cache = {}
 
 def read_trinket_data(csv_path):
     """Read trinket data from the CSV file."""
@@ -20,34 +31,87 @@ def read_trinket_data(csv_path):
         print(f"Error reading CSV file: {str(e)}")
     return items
 
-def crop_sprite(spritesheet_path, coordinates, output_path):
-    """Crop a sprite from the spritesheet using the given coordinates."""
+@lru_cache(maxsize=None)
+def find_asset_root(spritesheet, start=SCRIPT_DIR):
+    """Walk up from start looking for the unpacked asset directory containing the spritesheet"""
+    spritesheet = spritesheet.lstrip("/\\")
+    for directory in [Path(start).resolve()] + list(Path(start).resolve().parents):
+        if (directory / spritesheet).is_file():
+            return directory
+    return None
+
+def resolve_spritesheet_path(spritesheet, asset_root=None):
+    """Find the spritesheet file for a `spritesheet` field, returning None if it can't be found"""
+    relative_path = spritesheet.lstrip("/\\")
+    candidates = []
+    if asset_root:
+        candidates.append(Path(asset_root) / relative_path)
+    # Sheets copied next to the script or into the working directory, as older runs required
+    candidates.append(SCRIPT_DIR / os.path.basename(relative_path))
+    candidates.append(Path(os.path.basename(relative_path)))
+
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate.resolve()
+    return None
+
+def get_sheet(spritesheet_path):
+    """Return the decoded spritesheet, decoding it on first use"""
+    key = Path(spritesheet_path).resolve()
+    if key not in _sheet_cache:
+        _sheet_cache[key] = load_sheet(key)
+    return _sheet_cache[key]
+
+def clear_sheet_cache():
+    """Drop all decoded spritesheets"""
+    _sheet_cache.clear()
+
+def crop_sprite(spritesheet, coordinates, output_path):
+    """Crop a sprite from a spritesheet (a path or an already decoded sheet) using the given coordinates."""
     try:
-        with Image.open(spritesheet_path) as img:
-            x, y, w, h = coordinates
-            cropped = img.crop((x, y, x + w, y + h))
-            cropped.save(output_path)
+        sheet = get_sheet(spritesheet) if isinstance(spritesheet, (str, os.PathLike)) else spritesheet
+        save_view(crop_view(sheet, coordinates), output_path)
+        return True
     except Exception as e:
         print(f"Error processing {output_path}: {str(e)}")
+        return False
+
+def slice_spritesheet(spritesheet_path, items, output_dir):
+    """Write every item's icon from one spritesheet, returning the written paths"""
+    try:
+        sheet = get_sheet(spritesheet_path)
+    except Exception as e:
+        print(f"Error loading spritesheet {spritesheet_path}: {str(e)}")
+        return []
+
+    # Check every crop up front, before anything gets encoded
+    coordinates = [item['coordinates'] for item in items]
+    valid = validate_coordinates(sheet, coordinates)
+    transparent = find_transparent_crops(sheet, coordinates)
+
+    written_files = []
+    for item, is_valid, is_transparent in zip(items, valid, transparent):
+        if not is_valid:
+            print(f"Skipping {item['id']}: coordinates {item['coordinates']} are outside {spritesheet_path}")
+            continue
+        if is_transparent:
+            print(f"Skipping {item['id']}: crop is fully transparent")
+            continue
+
+        output_path = Path(output_dir) / f"{item['id']}.png"
+        print(f"Extracting {item['id']}...")
+        if crop_sprite(sheet, item['coordinates'], output_path):
+            written_files.append(output_path)
+    return written_files
+
+def slice_items(items, output_dir=DEFAULT_OUTPUT_DIR, asset_root=None):
+    """Slice every item's icon straight from the asset tree, returning the written paths"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
 
-def main():
-    # Create output directory if it doesn't exist
-    output_dir = Path("output_sprites")
-    output_dir.mkdir(exist_ok=True)
-    
-    # Read trinket data from CSV
-    csv_path = Path("../trinket_data.csv")
-    if not csv_path.exists():
-        print(f"Error: {csv_path} not found. Please run trinket_data_extractor.py first.")
-        return
-        
-    items = read_trinket_data(csv_path)
-    if not items:
-        print("No items found in the CSV file.")
-        return
-    
     # Keep track of processed items to avoid duplicates
     processed_items = set()
+    items_by_sheet = defaultdict(list)
     
     for item in items:
         if item['id'] in processed_items:
@@ -56,14 +120,56 @@ def main():
         processed_items.add(item['id'])
         
         # Determine spritesheet path
-        spritesheet_name = os.path.basename(item['spritesheet'])
-        spritesheet_path = Path(spritesheet_name)
-        
-        # Create output path
-        output_path = output_dir / f"{item['id']}.png"
+        root = asset_root or find_asset_root(item['spritesheet'])
+        spritesheet_path = resolve_spritesheet_path(item['spritesheet'], root)
+        if spritesheet_path is None:
+            print(f"Skipping {item['id']}: spritesheet {item['spritesheet']} not found")
+            continue
+        items_by_sheet[spritesheet_path].append(item)
+    
+    # Slice each spritesheet in one go
+    written_files = []
+    for spritesheet_path, sheet_items in items_by_sheet.items():
+        written_files.extend(slice_spritesheet(spritesheet_path, sheet_items, output_dir))
+    return written_files
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Slice trinket icons out of their spritesheets.")
+    parser.add_argument("--asset-root", type=Path, default=None,
+                        help="unpacked asset directory the spritesheet paths are relative to, ie: unpacked_assets_118 "
+                             "(default: searched for in the directories above this script)")
+    parser.add_argument("--csv", type=Path, default=DEFAULT_CSV_PATH,
+                        help="trinket data CSV to read (default: ../trinket_data.csv next to this script)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT_DIR,
+                        help="directory for the sliced icons (default: output_sprites next to this script)")
+    parser.add_argument("--optimize", action="store_true",
+                        help="losslessly shrink the sliced PNGs (palette reduction, max zlib compression, no metadata)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes used by --optimize (default: CPU count)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    # Read trinket data from CSV
+    csv_path = args.csv
+    if not csv_path.exists():
+        print(f"Error: {csv_path} not found. Please run trinket_data_extractor.py first.")
+        return
         
-        print(f"Extracting {item['id']}...")
-        crop_sprite(spritesheet_path, item['coordinates'], output_path)
+    items = read_trinket_data(csv_path)
+    if not items:
+        print("No items found in the CSV file.")
+        return
+
+    if args.asset_root and not args.asset_root.is_dir():
+        print(f"Error: asset root {args.asset_root} is not a directory.")
+        return
+
+    written_files = slice_items(items, args.output, args.asset_root)
+
+    if args.optimize:
+        optimize_pngs(written_files, workers=args.workers)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,248 @@
+import io
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+import trinket_wiki_format as formatter
+
+# Configuration variables for easy tuning
+WORD_COUNTS = [8, 32, 128]  # Description lengths in words
+TERM_DENSITIES = [0.0, 0.15, 0.4]  # Fraction of words replaced by MediaWiki link terms
+DESCRIPTIONS_PER_PROFILE = 12  # Synthetic descriptions per (length, density) combination
+SETS_COUNT = 10  # Synthetic trinket sets
+SEED = 0  # Seed for the synthetic data, so every run renders exactly the same input
+PASSES = 10  # Renders of the whole input per timed run, so short cases aren't dominated by timer noise
+REPEATS = 7  # Each case is timed this many times and the fastest run is kept
+REGRESSION_TOLERANCE = 0.20  # Fraction a case may be slower than the baseline before it counts as a regression
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+GOLDEN_DIR = SCRIPT_DIR / "golden"
+BASELINE_PATH = SCRIPT_DIR / "bench_format_baseline.json"
+
+FILLER_WORDS = [
+    "deals", "increased", "for", "seconds", "after", "the", "enemies", "nearby", "when", "you",
+    "gain", "chance", "to", "on", "hit", "all", "allies", "while", "below", "stacks", "up", "times"
+]
+QUALITIES = ["common", "uncommon", "rare", "epic", "legendary", "cursed"]
+
+def synthetic_word(rng, density):
+    """One word of a description: a link term, a color coded value, a "+" bonus or filler"""
+    roll = rng.random()
+    if roll < density:
+        return rng.choice(list(formatter.MEDIAWIKI_LINKS))
+    if roll < density + 0.08:
+        return f"\\cb{rng.randrange(16 ** 5):05x}{rng.randint(1, 50)}%\\d"
+    if roll < density + 0.12:
+        return f"+{rng.randint(1, 20)}"
+    return rng.choice(FILLER_WORDS)
+
+def generate_descriptions(rng):
+    """Synthetic description texts covering every length and term density"""
+    descriptions = []
+    for word_count in WORD_COUNTS:
+        for density in TERM_DENSITIES:
+            for _ in range(DESCRIPTIONS_PER_PROFILE):
+                descriptions.append(" ".join(synthetic_word(rng, density) for _ in range(word_count)))
+    return descriptions
+
+def generate_trinkets(rng, descriptions):
+    """Synthetic raw trinket rows and set rows, shaped like the extractor's CSVs"""
+    trinkets = []
+    for index, description in enumerate(descriptions):
+        trinket_id = f"bench_{index}"
+        trinkets.append({
+            "id": trinket_id,
+            "icon": f"[[File:{trinket_id}.png]]",
+            "name": f"Bench Trinket {index}",
+            "desc": description,
+            # Roughly a third of the trinkets have no Attuned description
+            "attune-desc": descriptions[-index - 1] if index % 3 else "",
+            "price": str(rng.randint(1, 500)),
+            "quality": QUALITIES[index % len(QUALITIES)],
+            "Set Item": "False",
+            "Item Set Name": ""
+        })
+
+    sets = []
+    for set_index in range(SETS_COUNT):
+        members = rng.sample(trinkets, rng.randint(2, 5))
+        set_name = f"Bench Set {set_index}"
+        for member in members:
+            member["Set Item"] = "True"
+            member["Item Set Name"] = set_name
+        effects = [f"{count}: {rng.choice(descriptions)}" for count in range(2, len(members) + 1)]
+        sets.append({
+            "Item Set Name": set_name,
+            "Items in Set": str(len(members)),
+            "Set Items": "\n".join(member["name"] for member in members),
+            "Set Item IDs": "\n".join(member["id"] for member in members),
+            "Set Effect": "\n\n".join(effects)
+        })
+    return trinkets, sets
+
+def render_quality_tables(trinkets):
+    outputs = []
+    for quality, items in formatter.group_by_quality(trinkets).items():
+        buffer = io.StringIO()
+        formatter.render_quality_table(quality, items, buffer.write)
+        outputs.append(buffer.getvalue())
+    return outputs
+
+def render_sets_table(trinkets, sets):
+    buffer = io.StringIO()
+    formatter.render_sets_table(sets, trinkets, buffer.write)
+    return [buffer.getvalue()]
+
+def build_cases(seed=SEED):
+    """Map each benchmark case to a function rendering all of its synthetic input"""
+    rng = random.Random(seed)
+    descriptions = generate_descriptions(rng)
+    trinkets, sets = generate_trinkets(rng, descriptions)
+    wrapped = [formatter.word_wrap(text) for text in descriptions]
+    uncolored = [formatter.apply_color_coding(text) for text in wrapped]
+    full_descriptions = [formatter.process_raw_description(row) for row in trinkets]
+    row_styles = [formatter.get_row_style(row["quality"], index) for index, row in enumerate(trinkets)]
+
+    return {
+        "word_wrap": lambda: [formatter.word_wrap(text) for text in descriptions],
+        "apply_color_coding": lambda: [formatter.apply_color_coding(text) for text in wrapped],
+        "apply_mediawiki_links": lambda: [formatter.apply_mediawiki_links(text, set()) for text in uncolored],
+        "split_description": lambda: [
+            "\t".join(formatter.split_description(description, row_style))
+            for description, row_style in zip(full_descriptions, row_styles)
+        ],
+        "quality_tables": lambda: render_quality_tables(trinkets),
+        "sets_table": lambda: render_sets_table(trinkets, sets)
+    }
+
+def use_default_settings():
+    """Pin the settings that change the output, so the golden files don't depend on local tweaks"""
+    formatter.TABLE_STYLE_MODE = "inline"
+    formatter.ICON_MODE = "files"
+
+def run_case(render, repeats=REPEATS, passes=PASSES):
+    """Time a case from a cold render cache, returning (fastest time per pass in seconds, outputs)"""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(passes):
+            formatter._render_cache.clear()
+            outputs = render()
+        elapsed = (time.perf_counter() - start) / passes
+        best = elapsed if best is None else min(best, elapsed)
+    return best, outputs
+
+def golden_path(name):
+    return GOLDEN_DIR / f"{name}.txt"
+
+def golden_text(outputs):
+    # One JSON string per output keeps every output on its own line and diffs readable
+    return "".join(json.dumps(output, ensure_ascii=False) + "\n" for output in outputs)
+
+def check_golden(name, outputs):
+    """Compare a case's outputs with its golden file, returning whether they match"""
+    path = golden_path(name)
+    if not path.exists():
+        print(f"{name}: no golden file. Run with --update-golden to create one.")
+        return False
+
+    expected = path.read_text(encoding="utf-8").splitlines()
+    actual = golden_text(outputs).splitlines()
+    if actual == expected:
+        return True
+
+    for index, (old, new) in enumerate(zip(expected, actual)):
+        if old != new:
+            print(f"{name}: output {index} differs from {path.name}")
+            print(f"  expected: {old[:200]}")
+            print(f"  actual:   {new[:200]}")
+            break
+    else:
+        print(f"{name}: {len(actual)} outputs, {path.name} has {len(expected)}")
+    return False
+
+def run_benchmarks(cases, repeats=REPEATS, passes=PASSES):
+    results = {}
+    for name, render in cases.items():
+        seconds, outputs = run_case(render, repeats, passes)
+        results[name] = {"seconds": round(seconds, 6), "outputs": outputs}
+        print(f"{name}: {seconds * 1000:.2f}ms for {len(outputs)} outputs")
+    return results
+
+def compare_to_baseline(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    """Print the change against the baseline for every case and return the regressions found"""
+    regressions = []
+    for name, seconds in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            print(f"{name}: no baseline")
+            continue
+        change = (seconds - previous) / previous
+        marker = ""
+        if change > tolerance:
+            marker = "  <-- REGRESSION"
+            regressions.append(name)
+        print(f"{name}: {previous * 1000:.2f}ms -> {seconds * 1000:.2f}ms ({change:+.1%}){marker}")
+    return regressions
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the wiki formatter and check its output against golden files.")
+    parser.add_argument("--cases", nargs="+", help="cases to run (default: all)")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help=f"timed runs per case (default: {REPEATS})")
+    parser.add_argument("--passes", type=int, default=PASSES, help=f"renders of the input per timed run (default: {PASSES})")
+    parser.add_argument("--update-golden", action="store_true", help="rewrite the golden files from the current output")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH,
+                        help="baseline timings file (default: bench_format_baseline.json next to this script)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these timings as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE,
+                        help=f"allowed slowdown per case before failing (default: {REGRESSION_TOLERANCE})")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    use_default_settings()
+    cases = build_cases()
+    if args.cases:
+        unknown = [name for name in args.cases if name not in cases]
+        if unknown:
+            print(f"Unknown cases: {', '.join(unknown)}. Choose from: {', '.join(cases)}")
+            sys.exit(2)
+        cases = {name: cases[name] for name in args.cases}
+
+    results = run_benchmarks(cases, args.repeats, args.passes)
+
+    if args.update_golden:
+        GOLDEN_DIR.mkdir(exist_ok=True)
+        for name, result in results.items():
+            golden_path(name).write_text(golden_text(result["outputs"]), encoding="utf-8")
+        print(f"Golden files updated in {GOLDEN_DIR}")
+    else:
+        mismatches = [name for name, result in results.items() if not check_golden(name, result["outputs"])]
+        if mismatches:
+            print(f"Output changed in: {', '.join(mismatches)}")
+            sys.exit(1)
+        print("All outputs match the golden files.")
+
+    timings = {name: result["seconds"] for name, result in results.items()}
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(timings, f, indent=1)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline found at {args.baseline}. Run with --save-baseline to create one.")
+        return
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(timings, baseline, args.tolerance)
+    if regressions:
+        print(f"Regressions in: {', '.join(regressions)}")
+        sys.exit(1)
+    print("No regressions against the baseline.")
+
+if __name__ == "__main__":
+    main()
@@ -123,7 +123,8 @@ def parse_sets_sval(file_path):
                 "Item Set Name": set_name,
                 "Items in Set": items_in_set,
                 "Set Items": "\n".join(item_names),
-                "Set Effect": "\n\n".join(set_effects)
+                "Set Effect": "\n\n".join(set_effects),
+                "Set Item IDs": "\n".join(item_ids)
             }
             set_rows.append(set_row)
 
@@ -213,7 +214,7 @@ def write_sets_to_csv(set_rows, output_file):
         print("No sets to write.")
         return
 
-    preferred_order = ["Item Set Name", "Items in Set", "Set Items", "Set Effect"]
+    preferred_order = ["Item Set Name", "Items in Set", "Set Items", "Set Effect", "Set Item IDs"]
 
     try:
         with open(output_file, 'w', newline='', encoding='utf-8') as file:
@@ -1,6 +1,11 @@
 import os
 import csv
-from collections import defaultdict
+import json
+import heapq
+import bisect
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections import defaultdict, OrderedDict
 import re
 
 # Configuration variables for easy tuning
@@ -17,6 +22,20 @@ DESC_FONT_SIZE = "14px"   # Font size for descriptions
 CELL_FONT_SIZE = "14px"   # Font size for other cells
 SET_NAME_FONT_SIZE = "16px"  # Font size for set names in the sets table
 NO_ATTUNEMENT_STYLE_LIGHTNESS = 0.3  # Lightness adjustment for "No Attunement" text color
+ICON_MODE = "files"  # "files" uses one [[File:<id>.png]] per icon, "atlas" crops icons out of the sprite_atlas.py sheets
+ATLAS_MAP_PATH = os.path.join("SpritesheetAutoSlicer", "output_atlas", "trinket_atlas_map.json")  # Relative to this script
+RENDER_CACHE_PATH = "render_cache.json"  # Rendered description fragments kept between runs, relative to this script
+RENDER_CACHE_SIZE = 4096  # Max number of rendered fragments kept (least recently used are dropped first)
+RENDER_CACHE_VERSION = 2  # Bump when the description rendering changes so old cached renders are discarded
+INCREMENTAL_REGENERATION = True  # Only re-render tables whose input rows (or this script's settings) changed
+TABLE_MANIFEST_PATH = "wiki_tables_manifest.json"  # Input hashes of the last written tables, relative to this script
+TABLE_RENDER_WORKERS = 1  # Worker processes rendering tables in parallel (1 renders serially, None uses the CPU count)
+TABLE_STYLE_MODE = "inline"  # "inline" puts a style="..." on every cell, "classes" uses short CSS classes from a TemplateStyles sheet
+TEMPLATESTYLES_PAGE = "Template:Trinkets/styles.css"  # Wiki page the generated stylesheet is uploaded to
+STYLESHEET_FILE = "trinket_tables.css"  # Generated stylesheet for the "classes" mode, relative to this script
+TABLE_WRITE_BUFFER_SIZE = 1 << 16  # Bytes of a table buffered in memory before it is flushed to its file
+DATA_MODULE_OUTPUT = True  # Also write the trinket and set data as a JSON data page for the Lua renderer (Module_Trinkets.lua)
+DATA_MODULE_FILE = "trinket_data_module.json"  # Generated data page, relative to this script
 
 # Dictionary for MediaWiki link terms
 MEDIAWIKI_LINKS = {
@@ -77,6 +96,9 @@ MEDIAWIKI_LINKS = {
     "Weapon": "Equipment#Weapons|Weapon"
 }
 
+# Changes whenever a link term or target is edited, so cached renders using the old table are not reused
+LINK_TABLE_VERSION = hashlib.sha1(json.dumps(list(MEDIAWIKI_LINKS.items())).encode()).hexdigest()[:12]
+
 # Color and style settings
 quality_styles = {
     "common": ["#262626", "#212121"],
@@ -94,7 +116,50 @@ name_colors = {
     "cursed": "red"
 }
 
+_atlas_map = None
+
 # Helper functions
+def load_atlas_map():
+    """Load the sprite_atlas.py coordinate map once, returning None if it doesn't exist"""
+    global _atlas_map
+    if _atlas_map is None:
+        atlas_map_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ATLAS_MAP_PATH)
+        try:
+            with open(atlas_map_path, 'r', encoding='utf-8') as f:
+                _atlas_map = json.load(f)
+        except FileNotFoundError:
+            print(f"Warning: {ATLAS_MAP_PATH} not found, falling back to individual icon files")
+            _atlas_map = {}
+        except Exception as e:
+            print(f"Error reading {ATLAS_MAP_PATH}: {e}")
+            _atlas_map = {}
+    return _atlas_map or None
+
+def format_atlas_icon(placement, sheet, size, name=""):
+    """Show one icon of an atlas sheet by clipping a scaled copy of the sheet"""
+    # MediaWiki only accepts whole pixel widths, so scale by the rounded sheet width
+    sheet_width = max(1, round(sheet['width'] * size / placement['w']))
+    scale = sheet_width / sheet['width']
+    return (
+        f"<span style=\"display:inline-block; width:{size}px; height:{size}px; overflow:hidden; vertical-align:middle;\">"
+        f"<span style=\"display:block; margin-left:-{placement['x'] * scale:g}px; margin-top:-{placement['y'] * scale:g}px;\">"
+        f"[[File:{sheet['file']}|{sheet_width}px|link=|alt={name}]]"
+        f"</span></span>"
+    )
+
+def format_icon(item, size):
+    """Format a trinket's icon at the given size"""
+    if ICON_MODE == "atlas":
+        atlas_map = load_atlas_map()
+        placement = atlas_map['icons'].get(item.get('id', '')) if atlas_map else None
+        if placement:
+            return format_atlas_icon(placement, atlas_map['sheets'][placement['sheet']], size, item.get('name', ''))
+
+    icon = item.get('icon', '')
+    if icon:
+        icon = icon[:-2] + f"|{size}px]]"  # Insert size before closing brackets
+    return icon
+
 def get_row_style(quality, index):
     styles = quality_styles.get(quality, ["White", "#F0F0F0"])
     return styles[index % 2]
@@ -106,6 +171,75 @@ def get_lighter_color(color):
     b = min(255, int(b + (255 - b) * NO_ATTUNEMENT_STYLE_LIGHTNESS))
     return f"#{r:02x}{g:02x}{b:02x}"
 
+def style_key(quality):
+    """The quality name used in CSS class names, "default" for qualities without their own colors"""
+    return quality if quality in quality_styles else "default"
+
+def style_attr(inline_style, classes):
+    """Cell attribute for the current TABLE_STYLE_MODE: a class list or the equivalent inline style"""
+    if TABLE_STYLE_MODE == "classes":
+        return f"class=\"{classes}\""
+    return f"style=\"{inline_style}\""
+
+def table_start():
+    """Opening lines of a wiki table, including the stylesheet reference in "classes" mode"""
+    if TABLE_STYLE_MODE == "classes":
+        return [f"<templatestyles src=\"{TEMPLATESTYLES_PAGE}\" />", "{| class=\"wikitable tt\""]
+    return ["{| class=\"wikitable\" style=\"border-collapse:collapse;\""]
+
+def table_header(colspan, title, headers):
+    """Opening lines, title and column headers of a wiki table"""
+    title_attr = style_attr(f"font-size:{MAIN_HEADER_FONT_SIZE}; padding:8px;", "tt-title")
+    header_attr = style_attr(f"font-size:{COLUMN_HEADER_FONT_SIZE}; padding:5px;", "tt-h")
+    header_cells = [f"! {header_attr} | '''{header}'''" for header in headers]
+    return "\n".join(table_start() + [
+        f"! colspan=\"{colspan}\" {title_attr} | {title}",
+        "|-",
+        "",
+        " !! ".join(header_cells)
+    ])
+
+def template_attr(inline_style, classes):
+    """style_attr() escaped for use in a str.format row template"""
+    return style_attr(inline_style, classes).replace("{", "{{").replace("}", "}}")
+
+def no_attunement_text(row_style):
+    return f"<i {style_attr(f'color:{get_lighter_color(row_style)};', 'tt-na')}>No Attunement</i>"
+
+def generate_stylesheet():
+    """Build the TemplateStyles stylesheet for the "classes" mode from the style settings"""
+    rules = [
+        ".tt { border-collapse:collapse; }",
+        f".tt-title {{ font-size:{MAIN_HEADER_FONT_SIZE}; padding:8px; }}",
+        f".tt-h {{ font-size:{COLUMN_HEADER_FONT_SIZE}; padding:5px; }}",
+        f".tt-i {{ text-align:center; padding:{ICON_PADDING}; }}",
+        f".tt-n {{ text-align:center; padding:{CELL_PADDING}; font-size:{NAME_FONT_SIZE}; }}",
+        f".tt-d {{ text-align:center; padding:{CELL_PADDING}; font-size:{DESC_FONT_SIZE}; }}",
+        f".tt-c {{ text-align:center; padding:{CELL_PADDING}; font-size:{CELL_FONT_SIZE}; }}",
+        f".tt-l {{ padding:{CELL_PADDING}; font-size:{CELL_FONT_SIZE}; }}",
+        f".tt-s {{ text-align:center; padding:{CELL_PADDING}; font-size:{SET_NAME_FONT_SIZE}; }}",
+        f".tt-si {{ padding:{CELL_PADDING}; font-size:{NAME_FONT_SIZE}; }}",
+        f".tt-se {{ padding:{CELL_PADDING}; font-size:{DESC_FONT_SIZE}; }}",
+        ".tt-m { vertical-align:middle; }",
+        ".tt-e { width:100%; }",
+        ".tt-er { display:flex; width:100%; margin:2px 0; }",
+        ".tt-ek { width:80px; text-align:right; font-weight:bold; padding-right:5px; }",
+        ".tt-ev { flex:1; text-align:left; padding-left:5px; }",
+    ]
+    styles = dict(quality_styles, default=["White", "#F0F0F0"])
+    colors = dict(name_colors, default="black")
+    for quality, row_styles in styles.items():
+        for parity, row_style in enumerate(row_styles):
+            rules.append(f".tt-{quality}-{parity} {{ background-color:{row_style}; }}")
+            if row_style.startswith("#"):
+                rules.append(f".tt-{quality}-{parity} .tt-na {{ color:{get_lighter_color(row_style)}; }}")
+        rules.append(f".tt-nc-{quality} {{ color:{colors.get(quality, 'black')}; }}")
+    return "\n".join(rules) + "\n"
+
+def write_stylesheet():
+    """Write the "classes" mode stylesheet, returning its file name if it changed"""
+    return write_if_changed(STYLESHEET_FILE, generate_stylesheet())
+
 def word_wrap(text, limit=DESCRIPTION_WRAP_LIMIT):
     # Split into lines first
     lines = []
@@ -137,63 +271,216 @@ def word_wrap(text, limit=DESCRIPTION_WRAP_LIMIT):
     # Join lines with <br>
     return "<br>".join(lines)
 
+def compile_mediawiki_linker(links):
+    """Precompile the link table into a single scanning regex plus per-term lookups"""
+    # Longer terms first so they take priority; ties keep dictionary order
+    terms = sorted(links, key=len, reverse=True)
+    # The lookahead finds the highest priority term starting at each position in one scan
+    scanner = re.compile(r"\b(?=(" + "|".join(re.escape(term) for term in terms) + r")\b)")
+    term_patterns = [re.compile(rf"{re.escape(term)}\b") for term in terms]
+    rank = {term: index for index, term in enumerate(terms)}
+    # Any other term matching where a term matches must be a prefix of it
+    prefixes = [
+        [other for other in range(index + 1, len(terms)) if term.startswith(terms[other])]
+        for index, term in enumerate(terms)
+    ]
+    return terms, scanner, term_patterns, rank, prefixes
+
+_LINK_TERMS, _LINK_SCANNER, _LINK_TERM_PATTERNS, _LINK_RANK, _LINK_PREFIXES = compile_mediawiki_linker(MEDIAWIKI_LINKS)
+
+def find_mediawiki_link_spans(text):
+    """Find the non-overlapping (start, end, term) spans to link, longest terms first"""
+    # Matches are handled in (priority, position) order, the same order as linking one term at a time
+    candidates = [(_LINK_RANK[match.group(1)], match.start()) for match in _LINK_SCANNER.finditer(text)]
+    heapq.heapify(candidates)
+
+    taken = bytearray(len(text))
+    term_ends = {}  # End of the last match seen per term; a term's own matches never overlap
+    spans = []
+    while candidates:
+        rank, start = heapq.heappop(candidates)
+
+        # Queue the next shorter term that also matches here
+        for prefix_rank in _LINK_PREFIXES[rank]:
+            if _LINK_TERM_PATTERNS[prefix_rank].match(text, start):
+                heapq.heappush(candidates, (prefix_rank, start))
+                break
+
+        if start < term_ends.get(rank, 0):
+            continue
+        end = start + len(_LINK_TERMS[rank])
+        term_ends[rank] = end
+        if not any(taken[start:end]):
+            taken[start:end] = b"\x01" * (end - start)
+            spans.append((start, end, _LINK_TERMS[rank]))
+
+    spans.sort()
+    return spans
+
 def apply_mediawiki_links(text, linked_terms=set()):
-    # Sort terms by length descending to prioritize longer matches
-    sorted_terms = sorted(MEDIAWIKI_LINKS.items(), key=lambda x: -len(x[0]))
-    
-    # Keep track of positions that are already part of a link
-    linked_positions = set()
-    
-    # First pass: find all matches and their positions
-    matches = []
-    for term, link in sorted_terms:
-        for match in re.finditer(rf"\b{re.escape(term)}\b", text):
-            start, end = match.span()
-            # Check if this match overlaps with any existing linked positions
-            if not any(pos in linked_positions for pos in range(start, end)):
-                matches.append((start, end, term, link))
-                # Mark these positions as linked
-                linked_positions.update(range(start, end))
-    
-    # Sort matches by start position in reverse order (to maintain string indices when replacing)
-    matches.sort(key=lambda x: x[0], reverse=True)
-    
-    # Second pass: apply the replacements from end to start
-    for start, end, term, link in matches:
-        text = text[:start] + f"[[{link}]]" + text[end:]
+    return link_spans(text, find_mediawiki_link_spans(text), linked_terms)
+
+def link_spans(text, spans, linked_terms=set()):
+    """Replace the given (start, end, term) spans of text with their MediaWiki links"""
+    if not spans:
+        return text
+
+    # Build the output in one go
+    parts = []
+    position = 0
+    for start, end, term in spans:
+        parts.append(text[position:start])
+        parts.append(f"[[{MEDIAWIKI_LINKS[term]}]]")
         linked_terms.add(term)
-    
-    return text
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
+
+# Match the exact pattern: \c followed by b, then exactly 5 hex digits, then content, then \d
+_COLOR_CODE_PATTERN = re.compile(r"\\cb([0-9a-fA-F]{5})([^\\]+)\\d")
 
 def apply_color_coding(text):
     # Remove color formatting codes, keeping only the content
-    # Match the exact pattern: \c followed by b, then exactly 5 hex digits, then content, then \d
-    return re.sub(r"\\cb([0-9a-fA-F]{5})([^\\]+)\\d", r"\2", text)
+    return _COLOR_CODE_PATTERN.sub(r"\2", text)
 
-def split_description(description, row_style):
+def render_description(text, linked_terms=set(), limit=DESCRIPTION_WRAP_LIMIT):
+    """Strip color codes from, link and wrap a description in a single pass over its lines"""
+    # Color codes are invisible, so they are removed before anything is measured
+    text = " ".join(apply_color_coding(text).split())
+    spans = find_mediawiki_link_spans(text)
+    span_starts = [start for start, _, _ in spans]
+
+    def link_at(position):
+        """The link span covering position, if any; lines never break inside a link"""
+        index = bisect.bisect_right(span_starts, position) - 1
+        if index >= 0 and spans[index][1] > position:
+            return spans[index]
+        return None
+
+    lines = []
+    start = 0
+    while start < len(text):
+        # Words starting with "+" always start a new line
+        end = text.find(" +", start)
+        end = len(text) if end < 0 else end
+        if end - start > limit:
+            # Break at the last space that fits, moving in front of any link it falls inside
+            cut = text.rfind(" ", start, start + limit + 1)
+            while cut >= 0 and link_at(cut):
+                cut = text.rfind(" ", start, link_at(cut)[0])
+            if cut < 0:
+                # The first word (with any link it starts) is longer than the limit, so it gets its own line
+                cut = text.find(" ", start)
+                while cut >= 0 and link_at(cut):
+                    cut = text.find(" ", link_at(cut)[1])
+                end = len(text) if cut < 0 else cut
+            else:
+                end = cut
+        lines.append(text[start:end])
+        start = end + 1
+
+    # Breaks replace a space each, so the link spans still line up with the broken text
+    return link_spans("\n".join(lines), spans, linked_terms).replace("\n", "<br>")
+
+_render_cache = OrderedDict()
+_render_cache_stats = {"hits": 0, "misses": 0}
+
+def cached_render(kind, text, limit, render, linked_terms=None):
+    """Return render(text) from the LRU render cache, rendering and storing it on a miss"""
+    key = (kind, text, limit, LINK_TABLE_VERSION)
+    cached = _render_cache.get(key)
+    if cached is not None:
+        _render_cache.move_to_end(key)
+        _render_cache_stats["hits"] += 1
+        rendered, terms = cached
+    else:
+        _render_cache_stats["misses"] += 1
+        terms = set()
+        rendered = render(text, terms)
+        _render_cache[key] = (rendered, terms)
+        while len(_render_cache) > RENDER_CACHE_SIZE:
+            _render_cache.popitem(last=False)
+
+    if linked_terms is not None:
+        linked_terms.update(terms)
+    return rendered
+
+def render_description_text(text, linked_terms=None, limit=DESCRIPTION_WRAP_LIMIT):
+    """Wrap, strip color codes from and link one description fragment"""
+    def render(text, terms):
+        return render_description(text, terms, limit)
+    return cached_render("description", text, limit, render, linked_terms)
+
+def render_linked_text(text, linked_terms=None):
+    """Link one fragment of text without wrapping it"""
+    return cached_render("links", text, None, apply_mediawiki_links, linked_terms)
+
+def load_render_cache():
+    """Load rendered fragments saved by earlier runs"""
+    cache_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), RENDER_CACHE_PATH)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        print(f"Error reading {RENDER_CACHE_PATH}, starting with an empty render cache: {e}")
+        return
+
+    if saved.get("version") != RENDER_CACHE_VERSION:
+        return
+    for kind, text, limit, link_version, rendered, terms in saved.get("entries", []):
+        _render_cache[(kind, text, limit, link_version)] = (rendered, set(terms))
+    while len(_render_cache) > RENDER_CACHE_SIZE:
+        _render_cache.popitem(last=False)
+
+def save_render_cache():
+    """Save the render cache, least recently used first"""
+    cache_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), RENDER_CACHE_PATH)
+    entries = [
+        [kind, text, limit, link_version, rendered, sorted(terms)]
+        for (kind, text, limit, link_version), (rendered, terms) in _render_cache.items()
+        # Renders for an outdated link table can never be hit again
+        if link_version == LINK_TABLE_VERSION
+    ]
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": RENDER_CACHE_VERSION, "entries": entries}, f, ensure_ascii=False)
+    except IOError as e:
+        print(f"Error writing {RENDER_CACHE_PATH}: {e}")
+
+def render_cache_report():
+    """Describe how many renders were served from the cache"""
+    hits, misses = _render_cache_stats["hits"], _render_cache_stats["misses"]
+    total = hits + misses
+    rate = hits / total if total else 0
+    return f"Render cache: {hits} hits, {misses} misses ({rate:.1%} hit rate, {len(_render_cache)} entries)"
+
+def description_parts(description, linked_terms=None):
+    """Render the Base and Attuned parts of a description, with None for a missing Attuned part"""
     base_desc = ""
-    attuned_desc = f"<i style=\"color:{get_lighter_color(row_style)};\">No Attunement</i>"
-    linked_terms = set()
+    attuned_desc = None
 
     if "Base:" in description:
         base_start = description.find("Base:") + len("Base:")
         base_end = description.find("Attuned:") if "Attuned:" in description else len(description)
         base_desc = description[base_start:base_end].strip().replace("\n", " ")
-        base_desc = word_wrap(base_desc)
-        # First remove color formatting, then apply MediaWiki links
-        base_desc = apply_color_coding(base_desc)
-        base_desc = apply_mediawiki_links(base_desc, linked_terms)
+        base_desc = render_description_text(base_desc, linked_terms)
 
     if "Attuned:" in description:
         attuned_start = description.find("Attuned:") + len("Attuned:")
         attuned_desc = description[attuned_start:].strip().replace("\n", " ")
-        attuned_desc = word_wrap(attuned_desc)
-        # First remove color formatting, then apply MediaWiki links
-        attuned_desc = apply_color_coding(attuned_desc)
-        attuned_desc = apply_mediawiki_links(attuned_desc, linked_terms)
+        attuned_desc = render_description_text(attuned_desc, linked_terms)
 
     return base_desc, attuned_desc
 
+def split_description(description, row_style):
+    linked_terms = set()
+    base_desc, attuned_desc = description_parts(description, linked_terms)
+    if attuned_desc is None:
+        attuned_desc = no_attunement_text(row_style)
+    return base_desc, attuned_desc
+
 def process_raw_description(row):
     """Convert raw description fields into formatted description"""
     desc = row.get("desc", "")
@@ -211,7 +498,7 @@ def process_raw_description(row):
 def filter_row_data(row):
     """Filter and transform raw row data into wiki format"""
     # Define the columns we want in the wiki output
-    wiki_columns = ["icon", "name", "description", "price", "quality", "Set Item", "Item Set Name"]
+    wiki_columns = ["id", "icon", "name", "description", "price", "quality", "Set Item", "Item Set Name"]
     filtered_row = {}
     
     # Process description fields
@@ -224,76 +511,149 @@ def filter_row_data(row):
             
     return filtered_row
 
-def generate_wiki_tables(data):
-    # Group data by quality
+_settings_fingerprint = None
+
+def settings_fingerprint():
+    """Hash everything besides the input rows that affects the output: this script and the atlas map"""
+    global _settings_fingerprint
+    if _settings_fingerprint is None:
+        digest = hashlib.sha256()
+        with open(os.path.abspath(__file__), 'rb') as f:
+            digest.update(f.read())
+        if ICON_MODE == "atlas":
+            digest.update(json.dumps(load_atlas_map(), sort_keys=True).encode())
+        _settings_fingerprint = digest.hexdigest()
+    return _settings_fingerprint
+
+def table_input_hash(*inputs):
+    """Hash a table's input rows together with the current settings"""
+    digest = hashlib.sha256(settings_fingerprint().encode())
+    digest.update(json.dumps(inputs, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+def load_table_manifest():
+    """Load the input hashes of the tables written by the last run"""
+    manifest_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), TABLE_MANIFEST_PATH)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Error reading {TABLE_MANIFEST_PATH}, regenerating all tables: {e}")
+        return {}
+
+def save_table_manifest(manifest):
+    manifest_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), TABLE_MANIFEST_PATH)
+    try:
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+    except IOError as e:
+        print(f"Error writing {TABLE_MANIFEST_PATH}: {e}")
+
+def table_file_path(file_name):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name)
+
+def is_table_current(file_name, content_hash, manifest):
+    """Whether the table was already written from exactly these inputs"""
+    return (
+        manifest is not None
+        and manifest.get(file_name) == content_hash
+        and os.path.exists(table_file_path(file_name))
+    )
+
+def record_table(file_name, content_hash, manifest):
+    if manifest is not None:
+        manifest[file_name] = content_hash
+
+def write_table(file_name, content):
+    with open(table_file_path(file_name), 'w', encoding='utf-8') as f:
+        f.write(content)
+
+def stream_table(file_name, kind, args):
+    """Render a table straight into a buffered temporary file, replacing the old table only once it is complete"""
+    path = table_file_path(file_name)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8', buffering=TABLE_WRITE_BUFFER_SIZE) as f:
+        _TABLE_RENDERERS[kind](*args, f.write)
+    os.replace(temp_path, path)
+
+def write_if_changed(file_name, content):
+    """Write a generated file only if its content changed, returning its file name if it did"""
+    path = table_file_path(file_name)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return []
+    write_table(file_name, content)
+    return [file_name]
+
+def group_by_quality(data):
+    """Group the wiki rows by lowercased quality, in order of first appearance"""
     grouped_data = defaultdict(list)
     for row in data:
         wiki_row = filter_row_data(row)
         grouped_data[row['quality'].lower()].append(wiki_row)
+    return grouped_data
 
-    # Generate tables
-    for quality, items in grouped_data.items():
-        quality_title = f"List of {quality.capitalize()} Trinkets"
-        
-        # Start table with header
-        table_output = [
-            "{| class=\"wikitable\" style=\"border-collapse:collapse;\"",
-            f"! colspan=\"7\" style=\"font-size:{MAIN_HEADER_FONT_SIZE}; padding:8px;\" | {quality_title}",
-            "|-",
-            ""
-        ]
-        
-        # Add column headers
-        headers = ["Icon", "Name", "Base Description", "Attuned Description", "Price", "Set Item", "Item Set Name"]
-        header_cells = [f"! style=\"font-size:{COLUMN_HEADER_FONT_SIZE}; padding:5px;\" | '''{header.title()}'''" for header in headers]
-        table_output.append(" !! ".join(header_cells))
-        
-        # Add rows for each item
-        for index, row in enumerate(items):
-            table_output.extend([
-                "|-",
-                ""
-            ])
-            
-            row_style = get_row_style(quality, index)
-            name_color = name_colors.get(quality, "black")
-            base_desc, attuned_desc = split_description(row['description'], row_style)
-            set_item = "" if row.get('Set Item', '').lower() == 'false' else "✔"
-            
-            # Format the icon
-            icon = row.get('icon', '')
-            if icon:
-                icon = icon.replace("[[File:", f"[[File:")
-                icon = icon[:-2] + f"|{ICON_SIZE}px]]"
-            
-            # Add link to set name if it exists
-            set_name = row.get('Item Set Name', '')
-            if set_name:
-                set_name = f"[[#{set_name.replace(' ', '_').lower()}|{set_name}]]"
-            
-            # Format each cell with proper indentation
-            cells = [
-                f"| style=\"text-align:center; padding:{ICON_PADDING};\" | {icon}",
-                f"| style=\"text-align:center; background-color:{row_style}; color:{name_color}; padding:{CELL_PADDING}; font-size:{NAME_FONT_SIZE};\" | <span id=\"{row['name'].replace(' ', '_').lower()}\">{row['name']}</span>",
-                f"| style=\"text-align:center; background-color:{row_style}; padding:{CELL_PADDING}; font-size:{DESC_FONT_SIZE};\" | {base_desc}",
-                f"| style=\"text-align:center; background-color:{row_style}; padding:{CELL_PADDING}; font-size:{DESC_FONT_SIZE};\" | {attuned_desc}",
-                f"| style=\"text-align:center; background-color:{row_style}; padding:{CELL_PADDING}; font-size:{CELL_FONT_SIZE};\" | {row.get('price', '')}",
-                f"| style=\"text-align:center; background-color:{row_style}; padding:{CELL_PADDING}; font-size:{CELL_FONT_SIZE};\" | {set_item}",
-                f"| style=\"background-color:{row_style}; padding:{CELL_PADDING}; font-size:{CELL_FONT_SIZE};\" | {set_name}"
-            ]
-            table_output.extend(cells)
-            table_output.append("")
+def quality_row_template(quality, parity):
+    """Compile the row layout for one quality and row parity, returning (row template, row style)"""
+    row_style = get_row_style(quality, parity)
+    name_color = name_colors.get(quality, "black")
+    row_class = f"tt-{style_key(quality)}-{parity}"
+    cells = [
+        f"| {template_attr(f'text-align:center; padding:{ICON_PADDING};', 'tt-i')} | {{icon}}",
+        f"| {template_attr(f'text-align:center; background-color:{row_style}; color:{name_color}; padding:{CELL_PADDING}; font-size:{NAME_FONT_SIZE};', f'tt-n {row_class} tt-nc-{style_key(quality)}')} | <span id=\"{{anchor}}\">{{name}}</span>",
+        f"| {template_attr(f'text-align:center; background-color:{row_style}; padding:{CELL_PADDING}; font-size:{DESC_FONT_SIZE};', f'tt-d {row_class}')} | {{base}}",
+        f"| {template_attr(f'text-align:center; background-color:{row_style}; padding:{CELL_PADDING}; font-size:{DESC_FONT_SIZE};', f'tt-d {row_class}')} | {{attuned}}",
+        f"| {template_attr(f'text-align:center; background-color:{row_style}; padding:{CELL_PADDING}; font-size:{CELL_FONT_SIZE};', f'tt-c {row_class}')} | {{price}}",
+        f"| {template_attr(f'text-align:center; background-color:{row_style}; padding:{CELL_PADDING}; font-size:{CELL_FONT_SIZE};', f'tt-c {row_class}')} | {{set_item}}",
+        f"| {template_attr(f'background-color:{row_style}; padding:{CELL_PADDING}; font-size:{CELL_FONT_SIZE};', f'tt-l {row_class}')} | {{set_name}}"
+    ]
+    # Each row is preceded by its separator and followed by a blank line
+    return "\n|-\n\n" + "\n".join(cells) + "\n", row_style
+
+def render_quality_table(quality, items, write):
+    """Stream the wiki table for one quality to write(), one row at a time"""
+    write(table_header(7, f"List of {quality.capitalize()} Trinkets",
+                       ["Icon", "Name", "Base Description", "Attuned Description", "Price", "Set Item", "Item Set Name"]))
+    
+    templates = [quality_row_template(quality, parity) for parity in (0, 1)]
+    for index, row in enumerate(items):
+        row_template, row_style = templates[index % 2]
+        base_desc, attuned_desc = description_parts(row['description'], set())
+        if attuned_desc is None:
+            attuned_desc = no_attunement_text(row_style)
         
-        # End the table
-        table_output.extend([
-            "|}",
-            ""
-        ])
+        # Add link to set name if it exists
+        set_name = row.get('Item Set Name', '')
+        if set_name:
+            set_name = f"[[#{set_name.replace(' ', '_').lower()}|{set_name}]]"
         
-        # Save each table to a separate file
-        table_file_path = os.path.join(os.path.dirname(__file__), f"{quality}_trinkets_table.txt")
-        with open(table_file_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(table_output))
+        write(row_template.format(
+            icon=format_icon(row, ICON_SIZE),
+            anchor=row['name'].replace(' ', '_').lower(),
+            name=row['name'],
+            base=base_desc,
+            attuned=attuned_desc,
+            price=row.get('price', ''),
+            set_item="" if row.get('Set Item', '').lower() == 'false' else "✔",
+            set_name=set_name
+        ))
+    
+    # End the table
+    write("\n|}\n")
+
+def quality_table_jobs(data):
+    """List the quality tables as (file name, renderer, render arguments, hashed inputs) jobs"""
+    return [
+        (f"{quality}_trinkets_table.txt", "quality", (quality, items), (quality, items))
+        for quality, items in group_by_quality(data).items()
+    ]
+
+def generate_wiki_tables(data, manifest=None, workers=TABLE_RENDER_WORKERS):
+    """Write one table per quality, skipping tables whose inputs match the manifest; returns the written files"""
+    return run_table_jobs(quality_table_jobs(data), manifest, workers)
 
 def load_trinket_data():
     """Load the raw trinket data from CSV"""
@@ -324,151 +684,278 @@ def load_trinket_data():
     
     return data, sets_data
 
-def format_set_items(set_items, trinket_data):
-    """Format set items with their quality colors and inline icons"""
-    # Create mappings of item names to their qualities and icons
-    item_data = {
-        item['name']: {
-            'quality': item['quality'].lower(),
-            'icon': item.get('icon', '')
-        } for item in trinket_data
-    }
-    
-    items = set_items.split('\n')
+def build_trinket_index(trinket_data):
+    """Index the trinkets by id and by name once, to be shared by every set row"""
+    by_id = {}
+    by_name = defaultdict(list)
+    for item in trinket_data:
+        if item.get('id'):
+            by_id[item['id'].lower()] = item
+        by_name[item['name']].append(item)
+    return {'by_id': by_id, 'by_name': by_name}
+
+def resolve_set_items(set_row, trinket_index):
+    """Match each item listed in a set row to its trinket, returning (name, trinket or None) pairs"""
+    names = set_row.get('Set Items', '').split('\n')
+    item_ids = (set_row.get('Set Item IDs') or '').split('\n')
+    if len(item_ids) != len(names):
+        item_ids = [''] * len(names)
+    set_name = set_row.get('Item Set Name', '')
+
+    resolved = []
+    for name, item_id in zip(names, item_ids):
+        name = name.strip()
+        if not name:
+            continue
+        item = trinket_index['by_id'].get(item_id.strip().lower())
+        if item is None:
+            # Older CSVs only list names; if a name is reused, prefer the trinket belonging to this set
+            candidates = trinket_index['by_name'].get(name, [])
+            in_set = [candidate for candidate in candidates if candidate.get('Item Set Name') == set_name]
+            candidates = in_set or candidates
+            item = candidates[-1] if candidates else None
+        resolved.append((name, item))
+    return resolved
+
+def format_set_items(set_items):
+    """Format resolved set items with their quality colors and inline icons"""
     formatted_items = []
     
-    for item in items:
-        item = item.strip()
-        if item:
-            data = item_data.get(item, {'quality': 'common', 'icon': ''})
-            quality = data['quality']
-            color = name_colors.get(quality, '#bababa')
-            
-            # Format the icon with size parameter
-            icon = data['icon']
-            if icon:
-                icon = icon.replace("[[File:", "[[File:")
-                icon = icon[:-2] + f"|{INLINE_ICON_SIZE}px]]"  # Insert size before closing brackets
-            
-            # Create link to the item in its quality table using the item's name as anchor
-            item_anchor = item.replace(' ', '_').lower()
-            formatted_items.append(
-                f"{icon} <span style=\"color:{color}; vertical-align:middle;\">[[#{item_anchor}|{item}]]</span>"
-            )
+    for item, data in set_items:
+        data = data or {'quality': 'common', 'icon': ''}
+        quality = data['quality'].lower()
+        color = name_colors.get(quality, '#bababa')
+        # Unknown qualities fall back to the common color here
+        color_key = quality if quality in name_colors else 'common'
+        icon = format_icon(data, INLINE_ICON_SIZE)
+        
+        # Create link to the item in its quality table using the item's name as anchor
+        item_anchor = item.replace(' ', '_').lower()
+        formatted_items.append(
+            f"{icon} <span {style_attr(f'color:{color}; vertical-align:middle;', f'tt-nc-{color_key} tt-m')}>[[#{item_anchor}|{item}]]</span>"
+        )
     
     return "<br>".join(formatted_items)
 
+def parse_set_effects(set_effects):
+    """Split set effects into (number of items, linked description) pairs"""
+    parsed = []
+    for effect in set_effects.split('\n\n'):
+        if ':' not in effect:
+            continue
+            
+        num_items, description = effect.split(':', 1)
+        # Apply MediaWiki links to the description
+        parsed.append((num_items, render_linked_text(description.strip())))
+    return parsed
+
 def format_set_effects(set_effects):
     """Format set effects as a sub-table"""
     if not set_effects:
         return ""
     
-    effects = set_effects.split('\n\n')
-    if not effects:
-        return ""
-    
     # Create rows for each effect without using a nested table
     rows = []
-    for effect in effects:
-        if ':' not in effect:
-            continue
-            
-        num_items, description = effect.split(':', 1)
-        # Apply MediaWiki links to the description
-        linked_description = apply_mediawiki_links(description.strip())
-        
+    for num_items, linked_description in parse_set_effects(set_effects):
         rows.append(
-            f"<div style=\"display:flex; width:100%; margin:2px 0;\">"
-            f"<div style=\"width:80px; text-align:right; font-weight:bold; padding-right:5px;\">{num_items} items:</div>"
-            f"<div style=\"flex:1; text-align:left; padding-left:5px;\">{linked_description}</div>"
+            f"<div {style_attr('display:flex; width:100%; margin:2px 0;', 'tt-er')}>"
+            f"<div {style_attr('width:80px; text-align:right; font-weight:bold; padding-right:5px;', 'tt-ek')}>{num_items} items:</div>"
+            f"<div {style_attr('flex:1; text-align:left; padding-left:5px;', 'tt-ev')}>{linked_description}</div>"
             f"</div>"
         )
     
-    return "<div style=\"width:100%;\">" + "".join(rows) + "</div>"
+    return f"<div {style_attr('width:100%;', 'tt-e')}>" + "".join(rows) + "</div>"
 
-def get_set_icons(set_items, trinket_data, size=None):
-    """Get formatted icons for all items in a set"""
+def get_set_icons(set_items, size=None):
+    """Get formatted icons for all resolved items in a set"""
     # Use SET_ICON_SIZE by default
     if size is None:
         size = SET_ICON_SIZE
-        
-    # Create mapping of item names to their icons
-    item_data = {item['name']: item.get('icon', '') for item in trinket_data}
     
     icons = []
-    items = set_items.split('\n')
-    for item in items:
-        item = item.strip()
-        if item and item in item_data:
-            icon = item_data[item]
+    for _, data in set_items:
+        if data:
+            icon = format_icon(data, size)
             if icon:
-                icon = icon.replace("[[File:", "[[File:")
-                icon = icon[:-2] + f"|{size}px]]"  # Insert size before closing brackets
                 icons.append(icon)
     
     return " ".join(icons) if icons else ""
 
-def generate_sets_table(sets_data, trinket_data):
-    """Generate a table for trinket sets"""
-    # Start table with header
-    table_output = [
-        "{| class=\"wikitable\" style=\"border-collapse:collapse;\"",
-        f"! colspan=\"4\" style=\"font-size:{MAIN_HEADER_FONT_SIZE}; padding:8px;\" | Trinket Sets",
-        "|-",
-        ""
+def sets_row_template(parity):
+    """Compile the row layout of the sets table for one row parity"""
+    row_style = quality_styles['common'][parity]
+    row_class = f"tt-common-{parity}"
+    cells = [
+        f"| {template_attr(f'text-align:center; background-color:{row_style}; padding:{CELL_PADDING}; font-size:{SET_NAME_FONT_SIZE};', f'tt-s {row_class}')} | <span id=\"{{anchor}}\">{{name}}</span><br><br>{{icons}}",
+        f"| {template_attr(f'text-align:center; background-color:{row_style}; padding:{CELL_PADDING}; font-size:{CELL_FONT_SIZE};', f'tt-c {row_class}')} | {{count}}",
+        f"| {template_attr(f'background-color:{row_style}; padding:{CELL_PADDING}; font-size:{NAME_FONT_SIZE};', f'tt-si {row_class}')} | {{items}}",
+        f"| {template_attr(f'background-color:{row_style}; padding:{CELL_PADDING}; font-size:{DESC_FONT_SIZE};', f'tt-se {row_class}')} | {{effects}}"
     ]
+    return "\n|-\n\n" + "\n".join(cells) + "\n"
+
+def render_sets_table(sets_data, trinket_data, write):
+    """Stream the table of trinket sets to write(), one row at a time"""
+    write(table_header(4, "Trinket Sets", ["Set Name", "Items in Set", "Set Items", "Set Effects"]))
     
-    # Add column headers
-    headers = ["Set Name", "Items in Set", "Set Items", "Set Effects"]
-    header_cells = [f"! style=\"font-size:{COLUMN_HEADER_FONT_SIZE}; padding:5px;\" | '''{header}'''" for header in headers]
-    table_output.append(" !! ".join(header_cells))
+    # Index the trinkets once for all set rows
+    trinket_index = build_trinket_index(trinket_data)
     
-    # Add rows for each set
+    templates = [sets_row_template(parity) for parity in (0, 1)]
     for index, row in enumerate(sets_data):
-        table_output.extend([
-            "|-",
-            ""
-        ])
-        
-        row_style = quality_styles['common'][index % 2]
-        
-        # Format set items with quality colors and inline icons
-        formatted_items = format_set_items(row.get('Set Items', ''), trinket_data)
-        
-        # Get set icons
-        set_icons = get_set_icons(row.get('Set Items', ''), trinket_data)
-        
-        # Format set name with icons underneath and add anchor
+        set_items = resolve_set_items(row, trinket_index)
         set_name = row.get('Item Set Name', '')
-        set_name_anchor = set_name.replace(' ', '_').lower()
-        set_name_cell = (
-            f"<span id=\"{set_name_anchor}\">{set_name}</span><br><br>"
-            f"{set_icons}"
-        )
         
-        # Format set effects as sub-table
-        set_effects = format_set_effects(row.get('Set Effect', ''))
-        
-        # Format each cell with proper indentation
-        cells = [
-            f"| style=\"text-align:center; background-color:{row_style}; padding:{CELL_PADDING}; font-size:{SET_NAME_FONT_SIZE};\" | {set_name_cell}",
-            f"| style=\"text-align:center; background-color:{row_style}; padding:{CELL_PADDING}; font-size:{CELL_FONT_SIZE};\" | {row.get('Items in Set', '')}",
-            f"| style=\"background-color:{row_style}; padding:{CELL_PADDING}; font-size:{NAME_FONT_SIZE};\" | {formatted_items}",
-            f"| style=\"background-color:{row_style}; padding:{CELL_PADDING}; font-size:{DESC_FONT_SIZE};\" | {set_effects}"
-        ]
-        table_output.extend(cells)
-        table_output.append("")
+        write(templates[index % 2].format(
+            anchor=set_name.replace(' ', '_').lower(),
+            name=set_name,
+            icons=get_set_icons(set_items),
+            count=row.get('Items in Set', ''),
+            items=format_set_items(set_items),
+            effects=format_set_effects(row.get('Set Effect', ''))
+        ))
     
     # End the table
-    table_output.extend([
-        "|}",
-        ""
-    ])
-    
-    # Save the sets table
-    table_file_path = os.path.join(os.path.dirname(__file__), "trinket_sets_table.txt")
-    with open(table_file_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(table_output))
+    write("\n|}\n")
+
+def sets_table_jobs(sets_data, trinket_data):
+    """List the sets table as a (file name, renderer, render arguments, hashed inputs) job"""
+    # Only the trinket fields the sets table shows affect it
+    set_item_fields = [
+        {key: item.get(key) for key in ('id', 'name', 'quality', 'icon', 'Item Set Name')}
+        for item in trinket_data
+    ]
+    return [("trinket_sets_table.txt", "sets", (sets_data, trinket_data), (sets_data, set_item_fields))]
+
+def generate_sets_table(sets_data, trinket_data, manifest=None):
+    """Write the sets table unless its inputs match the manifest; returns the written files"""
+    return run_table_jobs(sets_table_jobs(sets_data, trinket_data), manifest)
+
+_TABLE_RENDERERS = {
+    "quality": render_quality_table,
+    "sets": render_sets_table
+}
+
+def render_table_job(file_name, kind, args):
+    """Stream one table to its file in a worker process, returning the render cache entries and stats it added"""
+    known_keys = set(_render_cache)
+    stats_before = dict(_render_cache_stats)
+    stream_table(file_name, kind, args)
+    new_entries = [(key, value) for key, value in _render_cache.items() if key not in known_keys]
+    stats = {name: count - stats_before[name] for name, count in _render_cache_stats.items()}
+    return new_entries, stats
+
+def merge_render_cache(entries, stats):
+    """Fold a worker's render cache entries and stats into this process"""
+    for key, value in entries:
+        _render_cache[key] = value
+    while len(_render_cache) > RENDER_CACHE_SIZE:
+        _render_cache.popitem(last=False)
+    for name, count in stats.items():
+        _render_cache_stats[name] += count
+
+def run_table_jobs(jobs, manifest=None, workers=1):
+    """Render and write every table job that changed, in parallel when workers isn't 1; returns the written files"""
+    pending = []
+    for file_name, kind, args, hash_inputs in jobs:
+        content_hash = table_input_hash(*hash_inputs)
+        if not is_table_current(file_name, content_hash, manifest):
+            pending.append((file_name, kind, args, content_hash))
+
+    if workers == 1 or len(pending) < 2:
+        for file_name, kind, args, content_hash in pending:
+            stream_table(file_name, kind, args)
+            record_table(file_name, content_hash, manifest)
+        return [job[0] for job in pending]
+
+    # The tables don't depend on each other, so each worker streams its own table file
+    with ProcessPoolExecutor(max_workers=workers, initializer=load_render_cache) as executor:
+        futures = {
+            executor.submit(render_table_job, file_name, kind, args): (file_name, content_hash)
+            for file_name, kind, args, content_hash in pending
+        }
+        for future in as_completed(futures):
+            file_name, content_hash = futures[future]
+            new_entries, stats = future.result()
+            record_table(file_name, content_hash, manifest)
+            merge_render_cache(new_entries, stats)
+    return [job[0] for job in pending]
+
+def build_data_module(trinket_data, sets_data):
+    """Collect the trinket and set data, with descriptions already rendered, for the Lua renderer"""
+    settings = {
+        "style_mode": TABLE_STYLE_MODE,
+        "templatestyles_page": TEMPLATESTYLES_PAGE,
+        "cell_padding": CELL_PADDING,
+        "icon_padding": ICON_PADDING,
+        "icon_size": ICON_SIZE,
+        "inline_icon_size": INLINE_ICON_SIZE,
+        "set_icon_size": SET_ICON_SIZE,
+        "main_header_font_size": MAIN_HEADER_FONT_SIZE,
+        "column_header_font_size": COLUMN_HEADER_FONT_SIZE,
+        "name_font_size": NAME_FONT_SIZE,
+        "desc_font_size": DESC_FONT_SIZE,
+        "cell_font_size": CELL_FONT_SIZE,
+        "set_name_font_size": SET_NAME_FONT_SIZE,
+        "quality_styles": quality_styles,
+        "name_colors": name_colors,
+        "no_attunement_colors": {
+            row_style: get_lighter_color(row_style)
+            for row_styles in quality_styles.values() for row_style in row_styles
+        }
+    }
+
+    trinkets = []
+    icon_ids = set()
+    for quality, items in group_by_quality(trinket_data).items():
+        for row in items:
+            base_desc, attuned_desc = description_parts(row['description'])
+            trinkets.append({
+                "id": row.get('id', ''),
+                "name": row['name'],
+                "quality": quality,
+                "price": row.get('price', ''),
+                "icon": row.get('icon', ''),
+                "set_item": row.get('Set Item', '').lower() != 'false',
+                "set": row.get('Item Set Name', ''),
+                "base": base_desc,
+                "attuned": attuned_desc
+            })
+            icon_ids.add(row.get('id', ''))
+
+    sets = []
+    trinket_index = build_trinket_index(trinket_data)
+    for row in sets_data:
+        items = []
+        for name, item in resolve_set_items(row, trinket_index):
+            items.append({
+                "name": name,
+                "id": item.get('id', '') if item else '',
+                "quality": item['quality'].lower() if item else 'common',
+                "icon": item.get('icon', '') if item else ''
+            })
+            if item:
+                icon_ids.add(item.get('id', ''))
+        set_effects = row.get('Set Effect', '')
+        sets.append({
+            "name": row.get('Item Set Name', ''),
+            "count": row.get('Items in Set', ''),
+            "items": items,
+            "effects": parse_set_effects(set_effects) if set_effects else None
+        })
+
+    module = {"settings": settings, "trinkets": trinkets, "sets": sets}
+    atlas_map = load_atlas_map() if ICON_MODE == "atlas" else None
+    if atlas_map:
+        module["atlas"] = {
+            "sheets": atlas_map['sheets'],
+            "icons": {icon_id: placement for icon_id, placement in atlas_map['icons'].items() if icon_id in icon_ids}
+        }
+    return module
+
+def write_data_module(trinket_data, sets_data):
+    """Write the JSON data page read by Module_Trinkets.lua, returning its file name if it changed"""
+    module = build_data_module(trinket_data, sets_data)
+    return write_if_changed(DATA_MODULE_FILE, json.dumps(module, ensure_ascii=False, separators=(',', ':')))
 
 def main():
     # Load the raw data
@@ -478,9 +965,27 @@ def main():
         return
 
     # Generate wiki tables
-    generate_wiki_tables(trinket_data)
+    manifest = load_table_manifest() if INCREMENTAL_REGENERATION else None
+    load_render_cache()
+    jobs = quality_table_jobs(trinket_data)
     if sets_data:
-        generate_sets_table(sets_data, trinket_data)
+        jobs += sets_table_jobs(sets_data, trinket_data)
+    written_files = run_table_jobs(jobs, manifest, TABLE_RENDER_WORKERS)
+    if TABLE_STYLE_MODE == "classes":
+        written_files += write_stylesheet()
+    if DATA_MODULE_OUTPUT:
+        written_files += write_data_module(trinket_data, sets_data)
+    save_render_cache()
+    if manifest is not None:
+        save_table_manifest(manifest)
+
+    print(render_cache_report())
+    if written_files:
+        print("Changed tables:")
+        for file_name in written_files:
+            print(f"  {file_name}")
+    else:
+        print("No tables changed.")
     print("Wiki tables have been generated successfully.")
 
 if __name__ == "__main__":
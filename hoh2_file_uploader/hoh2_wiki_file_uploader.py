@@ -1,59 +1,23 @@
 import os
-import sys
 import json
 import base64
-import subprocess
-import importlib.metadata
 from pathlib import Path
-from tkinter import filedialog
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-
-def install_requirements():
-    """Install required packages from requirements.txt"""
-    requirements_file = Path(__file__).parent / "requirements.txt"
-    if not requirements_file.exists():
-        print("requirements.txt not found")
-        return
-    
-    # Read requirements
-    with open(requirements_file) as f:
-        requirements = [line.strip() for line in f if line.strip() and not line.startswith('#')]
-    
-    # Check which packages need to be installed
-    try:
-        installed = {dist.metadata['Name'].lower() for dist in importlib.metadata.distributions()}
-    except Exception:
-        installed = set()  # If we can't get installed packages, assume none are installed
-    
-    missing = []
-    for requirement in requirements:
-        pkg_name = requirement.split('==')[0].split('>=')[0].strip().lower()
-        if pkg_name not in installed:
-            missing.append(requirement)
-    
-    if missing:
-        print("Installing missing packages...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install"] + missing)
-            print("All requirements installed successfully!")
-        except subprocess.CalledProcessError as e:
-            print(f"Error installing packages: {e}")
-            sys.exit(1)
+from wiki_upload_engine import (
+    install_requirements, connect, list_files, format_metrics, UploadEngine, UploadJournal, WikiStateCache,
+    DEFAULT_SITE, UPLOAD_WORKERS, MAX_UPLOAD_WORKERS, REQUIREMENTS_FILE, GUI_REQUIREMENTS_FILE
+)
 
 # Install requirements before importing them
 if __name__ == "__main__":
-    install_requirements()
+    install_requirements((REQUIREMENTS_FILE, GUI_REQUIREMENTS_FILE))
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import mwclient
+from tkinter import ttk, messagebox, filedialog
 import threading
 
+# Configuration variables for easy tuning
+METRICS_REFRESH_MS = 1000  # How often the metrics panel updates during an upload
+
 class WikiUploaderGUI:
     def __init__(self, root):
         self.root = root
@@ -72,7 +36,9 @@ class WikiUploaderGUI:
         self.is_uploading = False
         self.is_logged_in = False
         self.should_cancel_upload = False
-        self.file_exists_cache = {}  # Add cache for file existence
+        self.wiki_state = WikiStateCache()  # Remembered exists/sha1/size/timestamp of files on the wiki
+        self.engine = None  # Upload engine for the wiki we're logged in to
+        self.upload_settings = {}  # Upload options, read once per run so worker threads never touch Tk variables
         
         # Initialize token storage
         self.token_file = self.creds_dir / ".wiki_token"
@@ -91,7 +57,7 @@ class WikiUploaderGUI:
         site_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=5)
         
         ttk.Label(site_frame, text="Wiki URL:").grid(row=0, column=0, sticky=tk.W, padx=(0, 5))
-        self.site_url_var = tk.StringVar(value="wiki.heroesofhammerwatch2.com")
+        self.site_url_var = tk.StringVar(value=DEFAULT_SITE)
         ttk.Entry(site_frame, textvariable=self.site_url_var).grid(row=0, column=1, sticky=(tk.W, tk.E))
         
         # Configure site_frame grid
@@ -153,6 +119,11 @@ class WikiUploaderGUI:
         ttk.Radiobutton(options_frame, text="Skip", variable=self.unknown_files_var, value="skip").grid(row=1, column=1, sticky=tk.W)
         ttk.Radiobutton(options_frame, text="Upload", variable=self.unknown_files_var, value="upload").grid(row=1, column=2, sticky=tk.W)
         
+        # Number of uploads running at once
+        ttk.Label(options_frame, text="Parallel Uploads:").grid(row=2, column=0, sticky=tk.W, pady=2)
+        self.upload_workers_var = tk.IntVar(value=UPLOAD_WORKERS)
+        ttk.Spinbox(options_frame, from_=1, to=MAX_UPLOAD_WORKERS, width=5, textvariable=self.upload_workers_var).grid(row=2, column=1, sticky=tk.W)
+        
         # Description Frame
         desc_frame = ttk.LabelFrame(left_frame, text="Upload Description", padding="5")
         desc_frame.grid(row=4, column=0, sticky=(tk.W, tk.E), pady=5)
@@ -173,6 +144,12 @@ class WikiUploaderGUI:
         self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate')
         self.progress_bar.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=5)
         
+        # Live throughput and latency metrics of the current (or last) upload
+        self.metrics_var = tk.StringVar(value="No upload metrics yet")
+        ttk.Label(progress_frame, textvariable=self.metrics_var, font=('TkDefaultFont', 8), justify=tk.LEFT).grid(row=2, column=0, sticky=tk.W)
+        self.export_metrics_button = ttk.Button(progress_frame, text="Export Metrics", command=self.export_metrics, state='disabled')
+        self.export_metrics_button.grid(row=3, column=0, sticky=tk.W, pady=(5, 0))
+        
         # Configure progress frame to expand
         progress_frame.columnconfigure(0, weight=1)
         
@@ -196,9 +173,13 @@ class WikiUploaderGUI:
         preview_hscrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
         self.preview_list['xscrollcommand'] = preview_hscrollbar.set
         
-        # Refresh button for preview
-        self.refresh_button = ttk.Button(preview_frame, text="Refresh File List", command=self.refresh_file_list)
-        self.refresh_button.grid(row=1, column=0, pady=5)
+        # Refresh buttons for preview
+        refresh_frame = ttk.Frame(preview_frame)
+        refresh_frame.grid(row=1, column=0, pady=5)
+        self.refresh_button = ttk.Button(refresh_frame, text="Refresh File List", command=self.refresh_file_list)
+        self.refresh_button.grid(row=0, column=0, padx=5)
+        self.revalidate_button = ttk.Button(refresh_frame, text="Revalidate", command=self.revalidate_file_list)
+        self.revalidate_button.grid(row=0, column=1, padx=5)
         
         # File count label
         self.file_count_var = tk.StringVar(value="No files found")
@@ -304,6 +285,11 @@ class WikiUploaderGUI:
 
     def _init_encryption(self):
         """Initialize encryption for token storage"""
+        # Imported here so the rest of the uploader loads without paying for cryptography up front
+        from cryptography.fernet import Fernet
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+        
         key_file = self.creds_dir / ".wiki_key"
         if not key_file.exists():
             # Generate a new key
@@ -354,6 +340,7 @@ class WikiUploaderGUI:
             self.login_button.state(['disabled'])
             self.upload_button.state(['!disabled'])
             self.refresh_button.state(['!disabled'])
+            self.revalidate_button.state(['!disabled'])
             self.username_var.set(self.username_var.get())  # Keep the username visible
             for widget in self.root.winfo_children():
                 if isinstance(widget, ttk.Entry) and widget.winfo_parent() == self.login_frame.winfo_name():
@@ -370,6 +357,7 @@ class WikiUploaderGUI:
             self.login_button.state(['!disabled'])
             self.upload_button.state(['disabled'])
             self.refresh_button.state(['!disabled'])
+            self.revalidate_button.state(['!disabled'])
             for widget in self.root.winfo_children():
                 if isinstance(widget, ttk.Entry) and widget.winfo_parent() == self.login_frame.winfo_name():
                     widget.state(['!disabled'])
@@ -379,6 +367,7 @@ class WikiUploaderGUI:
             self.upload_button.state(['disabled'])
             self.login_button.state(['disabled'])
             self.refresh_button.state(['disabled'])
+            self.revalidate_button.state(['disabled'])
             self.cancel_button.state(['!disabled'])  # Enable cancel button during upload
         else:
             self.cancel_button.state(['disabled'])  # Disable cancel button when not uploading
@@ -422,8 +411,8 @@ class WikiUploaderGUI:
             return
         
         try:
-            self.site = mwclient.Site(self.site_url_var.get(), path='/')
-            self.site.login(username=self.token_data['username'], password=self.token_data['password'])
+            self.site = connect(self.site_url_var.get(), self.token_data['username'], self.token_data['password'])
+            self.engine = UploadEngine(self.site, self.wiki_site(), self.wiki_state, log=self.log_message)
             self.is_logged_in = True
             self.progress_var.set("Logged in successfully using saved token")
             self.log_message(f"Logged in as {self.token_data['username']} using saved token")
@@ -451,6 +440,7 @@ class WikiUploaderGUI:
         """Internal method to handle the login process in a separate thread"""
         try:
             if self.connect_to_wiki():
+                self.engine = UploadEngine(self.site, self.wiki_site(), self.wiki_state, log=self.log_message)
                 self.is_logged_in = True
                 self.progress_var.set("Logged in successfully. Checking file statuses...")
                 self.log_message(f"Logged in as {self.username_var.get()}")
@@ -479,56 +469,13 @@ class WikiUploaderGUI:
 
     def connect_to_wiki(self):
         try:
-            # Create session with retry strategy
-            session = requests.Session()
-            retry_strategy = Retry(
-                total=3,
-                backoff_factor=1,
-                status_forcelist=[500, 502, 503, 504]
-            )
-            adapter = HTTPAdapter(max_retries=retry_strategy)
-            session.mount("http://", adapter)
-            session.mount("https://", adapter)
-            
-            # Connect to the wiki using the configured URL
-            self.site = mwclient.Site(self.site_url_var.get(), path='/', clients_useragent='HoH2WikiUploader/1.0')
-            self.site.login(username=self.username_var.get(), password=self.password_var.get())
+            # Connect to the wiki using the configured URL, through a pooled session with retries
+            self.site = connect(self.site_url_var.get(), self.username_var.get(), self.password_var.get())
             return True
         except Exception as e:
             messagebox.showerror("Login Error", f"Failed to connect to the wiki: {str(e)}")
             return False
 
-    def upload_file(self, file_path):
-        """Upload a single file to the wiki"""
-        try:
-            filename = file_path.name
-            
-            # Check if file already exists
-            existing_file = self.site.images[filename]
-            if existing_file.exists:
-                if self.existing_files_var.get() == "skip":
-                    self.log_message(f"Skipped {filename} (already exists)")
-                    return False
-                elif self.existing_files_var.get() == "update":
-                    # File will be overwritten, handled by ignore=True in upload
-                    pass
-            elif not existing_file.exists and self.unknown_files_var.get() == "skip":
-                self.log_message(f"Skipped {filename} (unknown status)")
-                return False
-            
-            # Create description with optional additional text
-            description = f"Uploading file: {filename[:-4]}"
-            if self.desc_var.get().strip():
-                description += f" - {self.desc_var.get().strip()}"
-            
-            with open(file_path, 'rb') as f:
-                self.site.upload(f, filename, description=description, ignore=self.existing_files_var.get() == "update")
-            self.log_message(f"Successfully uploaded {filename}")
-            return True
-        except Exception as e:
-            self.log_message(f"Error uploading {filename}: {str(e)}")
-            return False
-
     def start_upload(self):
         if not self.is_logged_in:
             messagebox.showerror("Error", "Please log in first")
@@ -556,126 +503,120 @@ class WikiUploaderGUI:
                 ):
                     return
         
+        try:
+            workers = min(max(1, self.upload_workers_var.get()), MAX_UPLOAD_WORKERS)
+        except tk.TclError:
+            workers = UPLOAD_WORKERS
+            self.upload_workers_var.set(workers)
+        self.upload_settings = {
+            'existing_files': self.existing_files_var.get(),
+            'unknown_files': self.unknown_files_var.get(),
+            'description': self.desc_var.get().strip(),
+            'workers': workers
+        }
+        
         self.is_uploading = True
         self.should_cancel_upload = False  # Reset cancel flag
         self.update_button_states()
         threading.Thread(target=self.upload_process, daemon=True).start()
+        self.root.after(METRICS_REFRESH_MS, self.update_metrics_panel)
 
     def upload_process(self):
-        """Process all files in the selected directory"""
+        """Process all files in the selected directory, several uploads at a time"""
         try:
             if not self.files_to_upload_dir or not self.files_to_upload_dir.exists():
-                self.progress_var.set("No directory selected")
-                messagebox.showinfo("Upload Complete", "No directory selected.")
+                self.run_in_ui(lambda: self.progress_var.set("No directory selected"))
+                self.run_in_ui(lambda: messagebox.showinfo("Upload Complete", "No directory selected."))
                 return
             
             # Get all files (excluding directories)
-            wiki_files = sorted(path for path in self.files_to_upload_dir.rglob('*') if path.is_file())
+            wiki_files = list_files(self.files_to_upload_dir)
             total_files = len(wiki_files)
             
             if total_files == 0:
-                self.progress_var.set("No files to upload")
-                messagebox.showinfo("Upload Complete", "No files found to upload.")
+                self.run_in_ui(lambda: self.progress_var.set("No files to upload"))
+                self.run_in_ui(lambda: messagebox.showinfo("Upload Complete", "No files found to upload."))
                 return
             
-            self.progress_bar['maximum'] = total_files
-            successful_uploads = 0
-            skipped_files = 0
+            self.run_in_ui(lambda: self.progress_bar.configure(maximum=total_files))
             
-            for i, file_path in enumerate(wiki_files, 1):
-                if self.should_cancel_upload:
-                    self.progress_var.set("Upload cancelled")
-                    messagebox.showinfo(
-                        "Upload Cancelled",
-                        f"Upload process cancelled. {successful_uploads} files uploaded, {skipped_files} files skipped."
-                    )
-                    break
-                
-                self.progress_bar['value'] = i
+            def show_progress(file_path, outcome, done, total):
                 rel_path = file_path.relative_to(self.files_to_upload_dir)
-                self.progress_var.set(f"Uploading {rel_path} ({i}/{total_files})")
-                
-                result = self.upload_file(file_path)
-                if result is None:  # User cancelled
-                    self.progress_var.set("Upload cancelled")
-                    messagebox.showinfo(
-                        "Upload Cancelled",
-                        f"Upload process cancelled. {successful_uploads} files uploaded, {skipped_files} files skipped."
-                    )
-                    break
-                elif result:  # Successful upload
-                    successful_uploads += 1
-                else:  # Failed or skipped
-                    skipped_files += 1
-                
-                self.root.update_idletasks()
+                progress_text = f"Uploaded {rel_path} ({done}/{total})"
+                self.run_in_ui(lambda: self.progress_var.set(progress_text))
+                self.run_in_ui(lambda: self.progress_bar.configure(value=done))
+            
+            counts = self.engine.upload_files(
+                wiki_files, self.upload_settings, show_progress, lambda: self.should_cancel_upload, UploadJournal()
+            )
+            successful_uploads = counts['uploaded']
+            skipped_files = sum(counts.values()) - successful_uploads  # Failed or skipped
             
-            if not self.should_cancel_upload:
-                self.progress_var.set(
+            if self.should_cancel_upload:
+                message = f"Upload process cancelled. {successful_uploads} files uploaded, {skipped_files} files skipped."
+                self.run_in_ui(lambda: self.progress_var.set("Upload cancelled"))
+                self.run_in_ui(lambda: messagebox.showinfo("Upload Cancelled", message))
+            else:
+                progress_text = (
                     f"Upload complete. {successful_uploads}/{total_files} files uploaded successfully. "
                     f"{skipped_files} files skipped."
                 )
-                messagebox.showinfo(
-                    "Upload Complete",
+                message = (
                     f"Successfully uploaded {successful_uploads} out of {total_files} files.\n"
                     f"{skipped_files} files were skipped."
                 )
+                self.run_in_ui(lambda: self.progress_var.set(progress_text))
+                self.run_in_ui(lambda: messagebox.showinfo("Upload Complete", message))
             
         except Exception as e:
-            self.log_message(f"Error during upload process: {str(e)}")
-            messagebox.showerror("Error", f"An error occurred during the upload process: {str(e)}")
+            error = str(e)
+            self.log_message(f"Error during upload process: {error}")
+            self.run_in_ui(lambda: messagebox.showerror("Error", f"An error occurred during the upload process: {error}"))
         finally:
-            self.progress_bar['value'] = 0
-            self.is_uploading = False
-            self.should_cancel_upload = False
-            self.update_button_states()
+            def finish():
+                self.progress_bar['value'] = 0
+                self.is_uploading = False
+                self.should_cancel_upload = False
+                self.update_button_states()
+                self.update_metrics_panel()
+                self.export_metrics_button.state(['!disabled'])
+            self.run_in_ui(finish)
 
-    def check_files_exist_on_wiki(self, filenames):
-        """Batch check if multiple files exist on the wiki"""
-        if not self.is_logged_in or not self.site:
-            return {filename: None for filename in filenames}
-        
+    def update_metrics_panel(self):
+        """Show the latest upload metrics, refreshing every METRICS_REFRESH_MS while an upload runs"""
+        if self.engine:
+            self.metrics_var.set(format_metrics(self.engine.metrics.summary()))
+        if self.is_uploading:
+            self.root.after(METRICS_REFRESH_MS, self.update_metrics_panel)
+
+    def export_metrics(self):
+        """Save the last upload's metrics as JSON or CSV"""
+        if not self.engine:
+            return
+        path = filedialog.asksaveasfilename(
+            title="Export Upload Metrics",
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("CSV", "*.csv")]
+        )
+        if not path:
+            return
         try:
-            # First check cache
-            results = {filename: self.file_exists_cache.get(filename) for filename in filenames}
-            
-            # Filter out filenames that need to be checked
-            to_check = [f for f in filenames if results[f] is None]
-            
-            if to_check:
-                # Use allimages query to get all files in one API call
-                # Break into chunks of 50 to avoid too large requests
-                chunk_size = 50
-                for i in range(0, len(to_check), chunk_size):
-                    chunk = to_check[i:i + chunk_size]
-                    
-                    try:
-                        # First try to get the files directly
-                        for filename in chunk:
-                            try:
-                                file_info = self.site.images[filename]
-                                exists = file_info.exists
-                                results[filename] = exists
-                                self.file_exists_cache[filename] = exists
-                            except Exception as e:
-                                self.log_message(f"Error checking individual file {filename}: {str(e)}")
-                                results[filename] = None
-                    
-                    except Exception as e:
-                        self.log_message(f"Error checking chunk {i//chunk_size + 1}: {str(e)}")
-                        # On chunk error, mark those files as unknown
-                        for filename in chunk:
-                            if filename not in results:
-                                results[filename] = None
-            
-            return results
-            
-        except Exception as e:
-            self.log_message(f"Error in check_files_exist_on_wiki: {str(e)}")
-            # On error, return None for uncached results
-            return {filename: self.file_exists_cache.get(filename) for filename in filenames}
+            self.engine.metrics.export(path)
+            self.log_message(f"Upload metrics saved to {path}")
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to save the metrics: {str(e)}")
+
+    def wiki_site(self):
+        """Key of the current wiki in the state cache"""
+        return self.site_url_var.get().strip()
 
-    def refresh_file_list(self):
+    def check_files_exist_on_wiki(self, filenames, on_batch=None, max_age=None):
+        """Batch check if multiple files exist on the wiki, asking only about files with stale states"""
+        if not self.is_logged_in or not self.engine:
+            return {filename: None for filename in filenames}
+        return self.engine.check_files_exist(filenames, on_batch, max_age)
+
+    def refresh_file_list(self, max_age=None):
         """Update the preview list with current files in the selected directory"""
         self.preview_list.config(state='normal')  # Enable editing temporarily
         self.preview_list.delete('1.0', tk.END)
@@ -688,114 +629,136 @@ class WikiUploaderGUI:
         
         # Start the background refresh process
         self.preview_list.insert(tk.END, "Checking file statuses...\n")
-        threading.Thread(target=self._refresh_file_list_process, daemon=True).start()
+        threading.Thread(target=self._refresh_file_list_process, args=(max_age,), daemon=True).start()
+
+    def revalidate_file_list(self):
+        """Refresh the preview list, checking every file on the wiki again regardless of the cache"""
+        self.refresh_file_list(max_age=0)
 
-    def _refresh_file_list_process(self):
+    def _refresh_file_list_process(self, max_age=None):
         """Background process for refreshing file list"""
         try:
             # Get all files (excluding directories)
-            wiki_files = sorted(path for path in self.files_to_upload_dir.rglob('*') if path.is_file())
-            total_files = len(wiki_files)
-            
-            # Count file types and check existence
-            file_types = {}
-            existing_count = 0
-            new_count = 0
-            unknown_count = 0
+            wiki_files = list_files(self.files_to_upload_dir)
+            filenames = list(dict.fromkeys(f.name for f in wiki_files))
             
-            # Prepare the new content
-            content = []
+            # Show the remembered states right away, then ask the wiki only about the stale ones
+            site = self.wiki_site()
+            stale = self.wiki_state.stale(site, filenames, max_age) if self.is_logged_in else []
+            self._show_file_list(wiki_files, self.wiki_state.statuses(site, filenames), len(stale))
+            if not stale:
+                return
             
             # Set up progress tracking for existence checking
-            if self.is_logged_in and total_files > 0:
-                self.root.after(0, lambda: setattr(self.progress_bar, 'maximum', total_files))
-                self.root.after(0, lambda: setattr(self.progress_bar, 'value', 0))
-            
-            # Get the width of the progress label (approximate characters)
-            progress_width = 60
-            
-            # Process files in chunks for batch existence checking
-            chunk_size = 50
-            for i in range(0, len(wiki_files), chunk_size):
-                chunk = wiki_files[i:i + chunk_size]
-                
-                # Update progress for this chunk
-                progress_text = f"Checking file status: Batch {i//chunk_size + 1}/{(total_files + chunk_size - 1)//chunk_size}"
-                self.root.after(0, lambda text=progress_text: self.progress_var.set(text))
-                self.root.after(0, lambda val=i: setattr(self.progress_bar, 'value', val))
-                
-                # Batch check existence
-                filenames = [f.name for f in chunk]
-                existence_results = self.check_files_exist_on_wiki(filenames) if self.is_logged_in else {f: None for f in filenames}
-                
-                # Process results for this chunk
-                for file_path in chunk:
-                    ext = file_path.suffix.lower() or '(no extension)'
-                    file_types[ext] = file_types.get(ext, 0) + 1
-                    
-                    rel_path = file_path.relative_to(self.files_to_upload_dir)
-                    exists = existence_results.get(file_path.name)
-                    
-                    if exists is None:
-                        status = "[?]"
-                        tag = 'unknown'
-                        unknown_count += 1
-                    elif exists:
-                        status = "[EXISTS]"
-                        tag = 'existing'
-                        existing_count += 1
-                    else:
-                        status = "[NEW]"
-                        tag = 'new'
-                        new_count += 1
-                    
-                    content.append((f"{status} {rel_path}\n", tag))
+            self.root.after(0, lambda: setattr(self.progress_bar, 'maximum', len(stale)))
+            self.root.after(0, lambda: setattr(self.progress_bar, 'value', 0))
             
-            # Update UI in the main thread
-            def update_ui():
-                self.preview_list.config(state='normal')
-                self.preview_list.delete('1.0', tk.END)
-                
-                # Configure tag colors
-                self.preview_list.tag_configure('existing', foreground='orange')
-                self.preview_list.tag_configure('new', foreground='green')
-                self.preview_list.tag_configure('unknown', foreground='gray')
-                
-                # Insert content with tags
-                for text, tag in content:
-                    self.preview_list.insert(tk.END, text, tag)
-                
-                # Create file count message
-                type_counts = [f"{count} {ext}" for ext, count in sorted(file_types.items())]
-                count_msg = f"Found {total_files} file{'s' if total_files != 1 else ''}\n"
-                count_msg += "Types: " + ", ".join(type_counts) + "\n"
-                if self.is_logged_in:
-                    count_msg += f"Status: {new_count} new, {existing_count} existing"
-                    if unknown_count > 0:
-                        count_msg += f", {unknown_count} unknown"
-                
-                self.file_count_var.set(count_msg)
-                self.progress_bar['value'] = 0
-                self.progress_var.set("File status check complete")
-                
-                if total_files == 0:
-                    self.preview_list.insert(tk.END, "No files found in selected directory\n")
-                    self.preview_list.config(state='disabled')
-                else:
-                    self.preview_list.config(state='disabled')  # Make read-only
+            def show_batch_progress(checked, total):
+                progress_text = f"Checking file status: {checked}/{total}"
+                self.root.after(0, lambda: self.progress_var.set(progress_text))
+                self.root.after(0, lambda: setattr(self.progress_bar, 'value', checked))
             
-            self.root.after(0, update_ui)
+            # Batch check existence of the stale files at once; each query covers up to 50 (or 500) files
+            existence_results = self.check_files_exist_on_wiki(filenames, show_batch_progress, max_age)
+            self.wiki_state.save()
+            self._show_file_list(wiki_files, existence_results, 0)
             
         except Exception as e:
+            error = str(e)
             def show_error():
-                self.log_message(f"Error refreshing file list: {str(e)}")
-                messagebox.showerror("Error", f"An error occurred while refreshing the file list: {str(e)}")
+                self.log_message(f"Error refreshing file list: {error}")
+                messagebox.showerror("Error", f"An error occurred while refreshing the file list: {error}")
             self.root.after(0, show_error)
 
+    def _show_file_list(self, wiki_files, existence_results, stale_count):
+        """Fill the preview list with the given file statuses; stale_count files are still being checked"""
+        total_files = len(wiki_files)
+        
+        # Count file types and statuses
+        file_types = {}
+        existing_count = 0
+        identical_count = 0
+        new_count = 0
+        unknown_count = 0
+        
+        # Prepare the new content
+        content = []
+        
+        for file_path in wiki_files:
+            ext = file_path.suffix.lower() or '(no extension)'
+            file_types[ext] = file_types.get(ext, 0) + 1
+            
+            rel_path = file_path.relative_to(self.files_to_upload_dir)
+            exists = existence_results.get(file_path.name)
+            
+            if exists is None:
+                status = "[?]"
+                tag = 'unknown'
+                unknown_count += 1
+            elif exists and self.wiki_state.is_identical(self.wiki_site(), file_path):
+                status = "[SAME]"
+                tag = 'identical'
+                identical_count += 1
+            elif exists:
+                status = "[EXISTS]"
+                tag = 'existing'
+                existing_count += 1
+            else:
+                status = "[NEW]"
+                tag = 'new'
+                new_count += 1
+            
+            content.append((f"{status} {rel_path}\n", tag))
+        
+        # Update UI in the main thread
+        def update_ui():
+            self.preview_list.config(state='normal')
+            self.preview_list.delete('1.0', tk.END)
+            
+            # Configure tag colors
+            self.preview_list.tag_configure('existing', foreground='orange')
+            self.preview_list.tag_configure('identical', foreground='steel blue')
+            self.preview_list.tag_configure('new', foreground='green')
+            self.preview_list.tag_configure('unknown', foreground='gray')
+            
+            # Insert content with tags
+            for text, tag in content:
+                self.preview_list.insert(tk.END, text, tag)
+            
+            # Create file count message
+            type_counts = [f"{count} {ext}" for ext, count in sorted(file_types.items())]
+            count_msg = f"Found {total_files} file{'s' if total_files != 1 else ''}\n"
+            count_msg += "Types: " + ", ".join(type_counts) + "\n"
+            if self.is_logged_in or unknown_count < total_files:
+                count_msg += f"Status: {new_count} new, {existing_count} existing, {identical_count} identical"
+                if unknown_count > 0:
+                    count_msg += f", {unknown_count} unknown"
+            
+            self.file_count_var.set(count_msg)
+            self.progress_bar['value'] = 0
+            if stale_count:
+                self.progress_var.set(f"Showing remembered statuses, revalidating {stale_count} files...")
+            else:
+                self.progress_var.set("File status check complete")
+            
+            if total_files == 0:
+                self.preview_list.insert(tk.END, "No files found in selected directory\n")
+                self.preview_list.config(state='disabled')
+            else:
+                self.preview_list.config(state='disabled')  # Make read-only
+        
+        self.root.after(0, update_ui)
+
+    def run_in_ui(self, callback):
+        """Run callback on the Tk main loop; Tk widgets must not be touched from worker threads"""
+        self.root.after(0, callback)
+
     def log_message(self, message):
-        self.log_text.insert(tk.END, f"{message}\n")
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
+        """Append a line to the log; safe to call from any thread"""
+        def append():
+            self.log_text.insert(tk.END, f"{message}\n")
+            self.log_text.see(tk.END)
+        self.run_in_ui(append)
 
     def cancel_upload(self):
         """Cancel the current upload process"""
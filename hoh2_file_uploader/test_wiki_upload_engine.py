@@ -0,0 +1,197 @@
+"""Tests for wiki_upload_engine; run with: python -m unittest test_wiki_upload_engine"""
+import json
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import wiki_upload_engine as engine
+
+try:
+    import requests
+    import mwclient
+except ImportError:
+    requests = mwclient = None
+
+@unittest.skipIf(mwclient is None, "requests and mwclient are not installed")
+class CreateSessionTest(unittest.TestCase):
+    def test_user_agent_matches_mwclient(self):
+        """The pooled session sends the User-Agent mwclient would have set on its own session"""
+        own = mwclient.Site(engine.DEFAULT_SITE, path='/', clients_useragent=engine.USER_AGENT, do_init=False)
+        session = engine.create_session()
+        self.assertEqual(session.headers['User-Agent'], own.connection.headers['User-Agent'])
+        self.assertTrue(session.headers['User-Agent'].startswith(engine.USER_AGENT))
+
+        pooled = mwclient.Site(engine.DEFAULT_SITE, path='/', clients_useragent=engine.USER_AGENT,
+                               pool=session, do_init=False)
+        self.assertEqual(pooled.connection.headers['User-Agent'], own.connection.headers['User-Agent'])
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """Answers the first `throttled` POSTs with 429 Too Many Requests, then with an empty JSON reply"""
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.requests += 1
+        status = 429 if self.server.requests <= self.server.throttled else 200
+        body = b"{}"
+        self.send_response(status)
+        self.send_header('Retry-After', '0')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@unittest.skipIf(requests is None, "requests is not installed")
+class RateControllerSessionTest(unittest.TestCase):
+    def serve(self, throttled):
+        """Local wiki stand-in throttling the first `throttled` requests, returning its URL"""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), ThrottlingHandler)
+        server.requests = 0
+        server.throttled = throttled
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server, f"http://127.0.0.1:{server.server_port}/api.php"
+
+    def post(self, url):
+        """POST through the pooled session with a rate controller's response hook attached"""
+        controller = engine.RateController(max_concurrency=4, log=lambda message: None)
+        with mock.patch.object(engine, 'HTTP_BACKOFF', 0):
+            session = engine.create_session()
+        session.hooks['response'].append(controller.response_hook)
+        response = session.post(url, data={'action': 'query'})
+        return controller, response
+
+    def test_retried_throttling_slows_down(self):
+        """A 429 that urllib3 retried away still halves the limit and pauses"""
+        server, url = self.serve(throttled=1)
+        controller, response = self.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(server.requests, 2)
+        self.assertEqual(controller.limit, 2)
+        self.assertGreater(controller.paused_until, 0)
+
+    def test_exhausted_retries_reach_the_hook(self):
+        """When every retry is throttled, the last 429 is returned to the hooks instead of raising RetryError"""
+        server, url = self.serve(throttled=engine.HTTP_RETRIES + 1)
+        controller, response = self.post(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(server.requests, engine.HTTP_RETRIES + 1)
+        self.assertEqual(controller.limit, 2)
+
+class FakeSite:
+    """Answers imageinfo queries with "missing" and accepts every upload, remembering each upload request"""
+    rights = []
+
+    def __init__(self, lag_replies=0):
+        self.uploads = []  # (params, files) of every action=upload request
+        self.lag_replies = lag_replies  # Lag replies before each upload request goes through
+        self.sent = []  # File bytes of every attempt, retries included
+        self.offline = False  # Status queries fail, as when the network drops
+
+    @staticmethod
+    def read_files(files):
+        """The bytes one attempt would send for each file, read the way requests encodes them"""
+        return {name: content if isinstance(content, bytes) else content.read() for name, (_, content) in (files or {}).items()}
+
+    def post(self, action, **params):
+        if self.offline:
+            raise ConnectionError("network is down")
+        titles = params['titles'].split('|')
+        return {'query': {'pages': {str(-n - 1): {'title': title, 'missing': ''} for n, title in enumerate(titles)}}}
+
+    def get_token(self, type):
+        return "token+\\"
+
+    def raw_call(self, script, data, files=None):
+        for _ in range(self.lag_replies):
+            # mwclient waits out a lag reply and sends the same data and files again
+            self.sent.append(self.read_files(files))
+        self.sent.append(self.read_files(files))
+        self.uploads.append((dict(data), files))
+        if 'stash' in data:
+            offset = int(data['offset']) + len(files['chunk'][1])
+            done = offset >= int(data['filesize'])
+            return json.dumps({'upload': {'result': 'Success' if done else 'Continue', 'offset': offset, 'filekey': 'key'}})
+        return json.dumps({'upload': {'result': 'Success', 'filename': data['filename']}})
+
+class UploadEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        self.site = FakeSite()
+        self.wiki_state = engine.WikiStateCache(self.dir / "state.json")
+        self.engine = engine.UploadEngine(self.site, 'wiki', self.wiki_state, log=lambda message: None)
+        self.settings = {'existing_files': 'skip', 'unknown_files': 'skip', 'description': '', 'workers': 1}
+
+    def test_single_slot_does_not_deadlock(self):
+        """With one slot, the per-file status check and the upload take turns instead of waiting on each other"""
+        file_path = self.dir / "icon.png"
+        file_path.write_bytes(b"png")
+        self.engine.controller.set_max(1)
+        outcomes = []
+        worker = threading.Thread(target=lambda: outcomes.append(self.engine.upload_and_record(file_path, self.settings, None)),
+                                  daemon=True)
+        worker.start()
+        worker.join(5)
+        self.assertFalse(worker.is_alive(), "upload_and_record deadlocked")
+        self.assertEqual(outcomes, ["uploaded"])
+        self.assertEqual([params['filename'] for params, files in self.site.uploads], ["icon.png"])
+        self.assertEqual(self.engine.controller.in_flight, 0)
+
+    def test_upload_sends_maxlag(self):
+        """A plain upload asks the wiki to refuse it while its database lags"""
+        file_path = self.dir / "icon.png"
+        file_path.write_bytes(b"png")
+        self.assertEqual(self.engine.upload_file(file_path, self.settings), "uploaded")
+        (params, files), = self.site.uploads
+        self.assertEqual(params['maxlag'], str(engine.MAXLAG))
+        self.assertEqual(params['action'], 'upload')
+        self.assertIn('file', files)
+
+    def test_retried_upload_resends_the_file(self):
+        """An upload mwclient sends again after a lag reply still carries the whole file"""
+        self.site.lag_replies = 1
+        file_path = self.dir / "icon.png"
+        file_path.write_bytes(b"png")
+        self.assertEqual(self.engine.upload_file(file_path, self.settings), "uploaded")
+        self.assertEqual(self.site.sent, [{'file': b"png"}, {'file': b"png"}])
+
+    def test_unchecked_files_are_retried_on_resume(self):
+        """Files skipped because their status check failed are not finished work for a resumed batch"""
+        checked, unchecked = self.dir / "checked.png", self.dir / "unchecked.png"
+        checked.write_bytes(b"png")
+        unchecked.write_bytes(b"gif")
+        self.wiki_state.update('wiki', checked.name, True, None)
+        self.site.offline = True
+        self.assertEqual(self.engine.upload_file(checked, self.settings), "skipped")
+        self.assertEqual(self.engine.upload_file(unchecked, self.settings), "unknown")
+
+        journal = engine.UploadJournal(self.dir / "journal.jsonl")
+        journal.begin('wiki', self.settings)
+        journal.record(checked, "skipped")
+        journal.record(unchecked, "unknown")
+        journal.close()  # Interrupted before finish()
+        resumed = engine.UploadJournal(self.dir / "journal.jsonl")
+        finished = resumed.begin('wiki', self.settings)
+        resumed.close()
+        self.assertEqual(list(finished), [engine.journal_key(checked)])
+
+    def test_chunked_upload_sends_maxlag(self):
+        """Every chunk, and publishing the stashed file, carry maxlag too"""
+        file_path = self.dir / "sheet.png"
+        file_path.write_bytes(b"x" * 10)
+        self.engine.chunk_threshold = self.engine.chunk_size = 4
+        self.assertEqual(self.engine.upload_file(file_path, self.settings), "uploaded")
+        self.assertEqual(len(self.site.uploads), 4)  # Three chunks, then publishing the stashed file
+        self.assertEqual(self.site.uploads[-1][0]['filekey'], 'key')
+        for params, files in self.site.uploads:
+            self.assertEqual(params['maxlag'], str(engine.MAXLAG))
+
+if __name__ == "__main__":
+    unittest.main()
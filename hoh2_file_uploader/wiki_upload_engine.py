@@ -0,0 +1,875 @@
+import os
+import csv
+import sys
+import json
+import math
+import time
+import hashlib
+import argparse
+import threading
+import subprocess
+import importlib.metadata
+from pathlib import Path
+from contextlib import nullcontext
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Configuration variables for easy tuning
+DEFAULT_SITE = "wiki.heroesofhammerwatch2.com"  # Wiki the files are uploaded to
+USER_AGENT = "HoH2WikiUploader/1.0"  # Identifies the uploader to the wiki's admins
+QUERY_BATCH_SIZE = 50  # Titles per imageinfo query, the API limit for normal accounts
+QUERY_BATCH_SIZE_HIGH = 500  # Titles per query for accounts with the apihighlimits right (bots, admins)
+UPLOAD_WORKERS = 4  # Default number of uploads in flight at once
+MAX_UPLOAD_WORKERS = 16  # Upper limit offered in the GUI
+SHA1_CHUNK_SIZE = 1 << 20  # Bytes read at a time when hashing local files
+HTTP_RETRIES = 3  # Retries of a request that failed with a connection error or a RETRY_STATUSES response
+HTTP_BACKOFF = 1  # Retries wait HTTP_BACKOFF * 2^n seconds, unless the wiki sends Retry-After
+RETRY_STATUSES = [429, 500, 502, 503, 504]  # Transient "too many requests" and server errors worth retrying
+THROTTLE_STATUSES = [429, 503]  # Statuses that ask for fewer requests, slowing the rate controller down
+CHUNKED_UPLOAD_THRESHOLD = 4 << 20  # Files larger than this (bytes) are uploaded in chunks through the upload stash
+CHUNK_SIZE = 1 << 20  # Bytes sent per chunk
+CHUNK_RETRIES = 3  # Times a failed chunk is sent again before the upload gives up
+MAXLAG = 5  # Seconds of database replication lag above which the wiki turns our requests away (the maxlag parameter)
+TARGET_LATENCY = 2.0  # Seconds; faster responses let more uploads run at once, slower ones halve them
+LAG_BACKOFF = 5  # Seconds every request waits after a lag or throttling reply that doesn't say how long to wait
+LATENCY_PERCENTILES = [50, 90, 99]  # Request latency percentiles reported in the upload metrics
+WIKI_STATE_FILE = Path(__file__).parent / "wiki_state_cache.json"  # Remote file states remembered between runs
+WIKI_STATE_TTL = 60 * 60  # Seconds a remembered file state is trusted before it is checked again
+WIKI_STATE_SAVE_INTERVAL = 30  # Seconds between state cache writes during a batch; it is always written at the end
+UPLOAD_JOURNAL_FILE = Path(__file__).parent / "upload_journal.jsonl"  # Per-file outcomes of the latest batch, for resuming it
+REQUIREMENTS_FILE = Path(__file__).parent / "requirements.txt"  # Packages the engine and command line need
+GUI_REQUIREMENTS_FILE = Path(__file__).parent / "requirements-gui.txt"  # Extra packages only the GUI needs
+USERNAME_ENV = "HOH2_WIKI_USERNAME"  # Environment variable the command line reads the username from
+PASSWORD_ENV = "HOH2_WIKI_PASSWORD"  # Environment variable the command line reads the password from
+
+OUTCOMES = ["uploaded", "skipped", "unknown", "failed", "dry_run", "resumed"]
+FINISHED_OUTCOMES = {"uploaded", "skipped"}  # Outcomes a resumed batch doesn't repeat; "unknown" files were never checked
+
+def install_requirements(requirements_files=(REQUIREMENTS_FILE,)):
+    """Install required packages from the given requirements files"""
+    # Read requirements
+    requirements = []
+    for requirements_file in requirements_files:
+        if not requirements_file.exists():
+            print(f"{requirements_file.name} not found")
+            continue
+        with open(requirements_file) as f:
+            requirements += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    
+    # Check which packages need to be installed, looking up only these instead of scanning every installed one
+    missing = []
+    for requirement in requirements:
+        pkg_name = requirement.split('==')[0].split('>=')[0].strip()
+        try:
+            importlib.metadata.version(pkg_name)
+        except importlib.metadata.PackageNotFoundError:
+            missing.append(requirement)
+    
+    if missing:
+        print("Installing missing packages...")
+        try:
+            subprocess.check_call([sys.executable, "-m", "pip", "install"] + missing)
+            print("All requirements installed successfully!")
+        except subprocess.CalledProcessError as e:
+            print(f"Error installing packages: {e}")
+            sys.exit(1)
+
+_local_sha1_cache = {}
+
+def local_sha1(path):
+    """SHA-1 of a local file in the hex form imageinfo reports, computed once per version of the file"""
+    stat = os.stat(path)
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+    sha1 = _local_sha1_cache.get(key)
+    if sha1 is None:
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(SHA1_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        sha1 = digest.hexdigest()
+        _local_sha1_cache[key] = sha1
+    return sha1
+
+def query_file_info(site, filenames, on_batch=None, throttle=None):
+    """Look up many files with batched imageinfo queries, returning {filename: imageinfo dict, False if missing, None if unknown}"""
+    batch_size = QUERY_BATCH_SIZE_HIGH if 'apihighlimits' in getattr(site, 'rights', []) else QUERY_BATCH_SIZE
+    results = {filename: None for filename in filenames}
+    
+    for i in range(0, len(filenames), batch_size):
+        batch = filenames[i:i + batch_size]
+        # The API answers with normalized titles ("File:My_icon.png" -> "File:My icon.png"), so map them back
+        requested = {f"File:{filename}": filename for filename in batch}
+        params = {
+            'prop': 'imageinfo',
+            'iiprop': 'timestamp|size|sha1',
+            'titles': '|'.join(requested),
+            'continue': '',
+            'maxlag': MAXLAG
+        }
+        
+        while True:
+            # POST, since 500 titles don't fit in a URL
+            with throttle or nullcontext():
+                response = site.post('query', **params)
+            query = response.get('query', {})
+            titles = {title: title for title in requested}
+            for normalized in query.get('normalized', []):
+                titles[normalized['to']] = normalized['from']
+            
+            for page in query.get('pages', {}).values():
+                filename = requested.get(titles.get(page.get('title')))
+                if filename is None:
+                    continue
+                if 'invalid' in page:
+                    results[filename] = None
+                elif 'missing' in page and not page.get('imageinfo'):
+                    results[filename] = False
+                elif page.get('imageinfo'):
+                    results[filename] = page['imageinfo'][0]
+                elif not results[filename]:
+                    # Page info without imageinfo; the imageinfo follows in a continuation
+                    results[filename] = {}
+            
+            if 'continue' not in response:
+                break
+            params.update(response['continue'])
+        
+        if on_batch:
+            on_batch(min(i + batch_size, len(filenames)), len(filenames))
+    
+    return results
+
+class WikiStateCache:
+    """State of files on each wiki (exists, sha1, size, timestamp), saved to disk between runs"""
+    def __init__(self, path=WIKI_STATE_FILE, ttl=WIKI_STATE_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.sites = {}  # {site: {filename: entry}}
+        self.dirty = False  # Changed since the last save
+        self.last_save = time.monotonic()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.sites = json.load(f).get('sites', {})
+        except (OSError, ValueError, AttributeError):
+            pass  # No cache yet, or an unreadable one; every file starts out unknown
+
+    def get(self, site, filename):
+        """The remembered entry for a file, or None if it was never checked"""
+        return self.sites.get(site, {}).get(filename)
+
+    def is_fresh(self, entry, max_age=None):
+        """Whether an entry was checked within max_age seconds (the TTL by default)"""
+        max_age = self.ttl if max_age is None else max_age
+        return entry is not None and time.time() - entry.get('checked_at', 0) < max_age
+
+    def update(self, site, filename, exists, info=None):
+        """Remember a file's state as of now"""
+        info = info or {}
+        entry = {
+            'exists': exists,
+            'sha1': info.get('sha1'),
+            'size': info.get('size'),
+            'timestamp': info.get('timestamp'),
+            'checked_at': time.time()
+        }
+        with self.lock:
+            self.sites.setdefault(site, {})[filename] = entry
+            self.dirty = True
+
+    def statuses(self, site, filenames):
+        """Remembered existence of each file (None if never checked), without asking the wiki"""
+        results = {}
+        for filename in filenames:
+            entry = self.get(site, filename)
+            results[filename] = entry['exists'] if entry else None
+        return results
+
+    def stale(self, site, filenames, max_age=None):
+        """Files whose remembered state is missing or older than max_age seconds (the TTL by default)"""
+        return [filename for filename in filenames if not self.is_fresh(self.get(site, filename), max_age)]
+
+    def is_identical(self, site, file_path):
+        """Whether the wiki is remembered to have exactly the bytes of this file"""
+        entry = self.get(site, file_path.name)
+        if not entry or not entry.get('exists') or not entry.get('sha1'):
+            return False
+        try:
+            return local_sha1(file_path) == entry['sha1']
+        except OSError:
+            return False
+
+    def save_if_due(self):
+        """Save unless the cache was saved within the last WIKI_STATE_SAVE_INTERVAL seconds"""
+        if self.dirty and time.monotonic() - self.last_save >= WIKI_STATE_SAVE_INTERVAL:
+            self.save()
+
+    def save(self):
+        """Write the cache to disk, replacing the old file only once the new one is complete"""
+        with self.lock:
+            self.dirty = False
+            self.last_save = time.monotonic()
+            temp_path = self.path.with_suffix('.tmp')
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'sites': self.sites}, f)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"Error saving wiki state cache: {e}")
+
+class UploadJournal:
+    """Append-only JSON lines record of a batch's per-file outcomes, so an interrupted batch resumes where it stopped"""
+    def __init__(self, path=UPLOAD_JOURNAL_FILE, resume=True):
+        self.path = Path(path)
+        self.resume = resume
+        self.lock = threading.Lock()
+        self.file = None
+
+    def read(self):
+        """Every entry in the journal, leaving out a line cut short by a crash"""
+        entries = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        pass
+        except OSError:
+            pass
+        return entries
+
+    def begin(self, site, settings):
+        """Open the journal for a batch, returning {file: sha1} of files an interrupted matching batch finished"""
+        # Only resume a batch that made the same decisions; e.g. files skipped as existing must be
+        # reconsidered when switching to update mode
+        batch = {
+            'site': site,
+            'existing_files': settings['existing_files'],
+            'unknown_files': settings['unknown_files'],
+            'description': settings['description']
+        }
+        entries = self.read() if self.resume else []
+        finished = {}
+        if entries and entries[0].get('batch') == batch and not any(entry.get('complete') for entry in entries):
+            for entry in entries[1:]:
+                if entry.get('outcome') in FINISHED_OUTCOMES:
+                    finished[entry['file']] = entry.get('sha1')
+                else:
+                    finished.pop(entry.get('file'), None)
+            self.file = open(self.path, 'a', encoding='utf-8')
+        else:
+            # The last batch completed (or doesn't match), so start a new journal
+            self.file = open(self.path, 'w', encoding='utf-8')
+            self._write({'batch': batch, 'started_at': time.time()})
+        return finished
+
+    def record(self, file_path, outcome):
+        """Append a file's outcome; finished files carry their SHA-1 so changed files aren't skipped on resume"""
+        sha1 = None
+        if outcome in FINISHED_OUTCOMES:
+            try:
+                sha1 = local_sha1(file_path)
+            except OSError:
+                pass
+        self._write({'file': journal_key(file_path), 'outcome': outcome, 'sha1': sha1, 'at': time.time()})
+
+    def finish(self):
+        """Mark the batch complete, so the next batch starts from scratch"""
+        self._write({'complete': True, 'at': time.time()})
+        self.close()
+
+    def close(self):
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+
+    def _write(self, entry):
+        # One flushed line per entry, so a crash loses at most the line being written
+        with self.lock:
+            self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+
+def journal_key(file_path):
+    return str(Path(file_path).resolve())
+
+def post_upload_request(site, params, files=None):
+    """Send one action=upload request, returning the API's upload result"""
+    response = json.loads(site.raw_call('api', params, files=files))
+    if 'error' in response:
+        raise Exception(f"{response['error'].get('code')}: {response['error'].get('info')}")
+    return response['upload']
+
+def post_chunk(site, params, filename, chunk):
+    """Send one chunk to the upload stash, returning the API's upload result"""
+    return post_upload_request(site, params, files={'chunk': (filename, chunk)})
+
+def post_upload(site, filename, description, ignore, file=None, filekey=None):
+    """Upload a file's bytes, or publish a stashed file, returning the API's upload result"""
+    # mwclient's site.upload only sends maxlag to index.php, so the API request is built here
+    params = {
+        'action': 'upload',
+        'format': 'json',
+        'filename': filename,
+        'comment': description,  # Also the description page text of a new file
+        'maxlag': str(MAXLAG),
+        'token': site.get_token('csrf')
+    }
+    if ignore:
+        params['ignorewarnings'] = '1'
+    if filekey:
+        params['filekey'] = filekey
+    return post_upload_request(site, params, files={'file': (filename, file)} if file is not None else None)
+
+def chunked_upload(site, file_path, filename, description, ignore, chunk_size=CHUNK_SIZE, retries=CHUNK_RETRIES, on_retry=None):
+    """Upload a file in chunks to the upload stash, then publish it; a failed chunk is retried on its own"""
+    file_size = file_path.stat().st_size
+    params = {
+        'action': 'upload',
+        'format': 'json',
+        'filename': filename,
+        'filesize': str(file_size),
+        'stash': '1',
+        'ignorewarnings': '1',  # Warnings (exists, duplicate) are reported when the stashed file is published
+        'maxlag': str(MAXLAG),
+        'token': site.get_token('csrf')
+    }
+    
+    offset = 0
+    with open(file_path, 'rb') as f:
+        while True:
+            f.seek(offset)
+            chunk = f.read(chunk_size)
+            params['offset'] = str(offset)
+            for attempt in range(retries + 1):
+                try:
+                    result = post_chunk(site, params, filename, chunk)
+                    break
+                except Exception:
+                    if attempt == retries:
+                        raise
+                    if on_retry:
+                        on_retry()
+                    time.sleep(HTTP_BACKOFF * 2 ** attempt)
+            
+            # Later chunks are appended to the stashed file named by the key of the first
+            params['filekey'] = result.get('filekey', params.get('filekey'))
+            if result.get('result') == 'Success':
+                break
+            if result.get('result') != 'Continue' or int(result['offset']) <= offset:
+                raise Exception(f"Unexpected chunk upload result: {result}")
+            # The wiki says how much it has, so a retried chunk never re-sends bytes that arrived
+            offset = int(result['offset'])
+    
+    return post_upload(site, filename, description, ignore, filekey=params['filekey'])
+
+def list_files(directory):
+    """Every file under directory (subdirectories included), in a stable order"""
+    return sorted(path for path in Path(directory).rglob('*') if path.is_file())
+
+class RateController:
+    """Adapts how many requests run at once to the wiki's load: one more per round of fast responses,
+    half as many after lag, throttling or slow responses (additive increase, multiplicative decrease)"""
+    def __init__(self, max_concurrency=UPLOAD_WORKERS, target_latency=TARGET_LATENCY, log=print):
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.log = log
+        self.limit = float(max_concurrency)  # Requests allowed at once; fractional so it can grow slowly
+        self.in_flight = 0
+        self.paused_until = 0.0  # Nothing is sent before this time.monotonic() after a lag or throttling reply
+        self.last_decrease = 0.0
+        self.condition = threading.Condition()
+
+    def set_max(self, max_concurrency):
+        """Change the ceiling, e.g. when a new batch starts with another number of workers"""
+        with self.condition:
+            self.max_concurrency = max(1, max_concurrency)
+            self.limit = min(self.limit, self.max_concurrency)
+            self.condition.notify_all()
+
+    def __enter__(self):
+        # Wait for a free slot, and for any pause the wiki asked for to pass
+        with self.condition:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    break
+                self.condition.wait(wait if wait > 0 else None)
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def observe(self, latency, lagged=False, throttled=False, retry_after=None):
+        """Feed back one response"""
+        now = time.monotonic()
+        with self.condition:
+            if lagged or throttled:
+                pause = retry_after if retry_after is not None else LAG_BACKOFF
+                self.paused_until = max(self.paused_until, now + pause)
+                self._decrease(now, f"{'lagging' if lagged else 'throttling requests'}, pausing {pause:g}s")
+            elif latency > self.target_latency:
+                self._decrease(now, f"slow to respond ({latency:.1f}s)")
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+    def _decrease(self, now, reason):
+        # Responses already in flight report the same trouble, so cut at most once per round trip
+        if now - self.last_decrease < self.target_latency:
+            return
+        self.last_decrease = now
+        self.limit = max(1.0, self.limit / 2)
+        self.log(f"Wiki is {reason}; {int(self.limit)} requests at a time now")
+
+    def response_hook(self, response, *args, **kwargs):
+        """requests response hook feeding every API response back into the controller"""
+        headers = response.headers
+        lagged = headers.get('MediaWiki-API-Error') == 'maxlag' or 'X-Database-Lag' in headers
+        # urllib3 retries throttled requests before requests sees a response, so check the attempts behind this one too
+        history = getattr(getattr(response.raw, 'retries', None), 'history', None) or ()
+        statuses = [response.status_code] + [attempt.status for attempt in history]
+        throttled = any(status in THROTTLE_STATUSES for status in statuses)
+        try:
+            retry_after = float(headers['Retry-After'])
+        except (KeyError, ValueError):
+            retry_after = None  # Missing, or the HTTP date form
+        self.observe(response.elapsed.total_seconds(), lagged, throttled, retry_after)
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    return sorted_values[max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)]
+
+def format_size(size):
+    for unit in ["B", "KiB", "MiB"]:
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+class UploadMetrics:
+    """Throughput, request latency, retries and time per phase of an upload batch"""
+    def __init__(self, controller=None):
+        self.controller = controller  # Reports how many uploads run at once, if given
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start measuring a new batch"""
+        with self.lock:
+            self.started = time.monotonic()
+            self.finished = None
+            self.latencies = []
+            self.retries = 0
+            self.files = []  # (file, outcome, bytes uploaded, seconds)
+            self.phase_seconds = {'check': 0.0, 'upload': 0.0}
+
+    def finish(self):
+        with self.lock:
+            self.finished = time.monotonic()
+
+    def add_phase_time(self, phase, seconds):
+        with self.lock:
+            self.phase_seconds[phase] += seconds
+
+    def record_retry(self):
+        with self.lock:
+            self.retries += 1
+
+    def record_file(self, file_path, outcome, size, seconds):
+        with self.lock:
+            self.files.append((str(file_path), outcome, size, seconds))
+
+    def response_hook(self, response, *args, **kwargs):
+        """requests response hook recording every API response's latency and the retries behind it"""
+        history = getattr(getattr(response.raw, 'retries', None), 'history', None) or ()
+        lagged = 'X-Database-Lag' in response.headers  # mwclient waits and sends the request again
+        with self.lock:
+            self.latencies.append(response.elapsed.total_seconds())
+            self.retries += len(history) + lagged
+
+    def summary(self):
+        """The batch's metrics so far, as a flat dict"""
+        with self.lock:
+            elapsed = (self.finished or time.monotonic()) - self.started
+            latencies = sorted(self.latencies)
+            files_done = len(self.files)
+            bytes_uploaded = sum(size for _, _, size, _ in self.files)
+            result = {
+                'elapsed_seconds': round(elapsed, 3),
+                'files_done': files_done,
+                'files_uploaded': sum(1 for _, outcome, _, _ in self.files if outcome == "uploaded"),
+                'bytes_uploaded': bytes_uploaded,
+                'files_per_second': round(files_done / elapsed, 3) if elapsed else 0.0,
+                'bytes_per_second': round(bytes_uploaded / elapsed) if elapsed else 0,
+                'requests': len(latencies),
+                'retries': self.retries,
+                'check_seconds': round(self.phase_seconds['check'], 3),
+                'upload_seconds': round(self.phase_seconds['upload'], 3)
+            }
+        for percent in LATENCY_PERCENTILES:
+            result[f'latency_p{percent}'] = round(percentile(latencies, percent), 3) if latencies else None
+        result['latency_max'] = round(latencies[-1], 3) if latencies else None
+        if self.controller:
+            result['concurrency'] = int(self.controller.limit)
+        return result
+
+    def export(self, path):
+        """Write the metrics to a .csv (metric,value rows) or .json (summary and per-file results) file"""
+        path = Path(path)
+        summary = self.summary()
+        if path.suffix.lower() == ".csv":
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(["metric", "value"])
+                writer.writerows(summary.items())
+        else:
+            with self.lock:
+                files = [
+                    {'file': file, 'outcome': outcome, 'bytes': size, 'seconds': round(seconds, 3)}
+                    for file, outcome, size, seconds in self.files
+                ]
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'summary': summary, 'files': files}, f, indent=1)
+
+def format_metrics(summary):
+    """A metrics summary as a few lines of text, for the GUI panel and the command line"""
+    if summary['latency_p50'] is None:
+        latency = "no requests yet"
+    else:
+        percentiles = "/".join(f"p{percent}" for percent in LATENCY_PERCENTILES)
+        values = "/".join(f"{summary[f'latency_p{percent}']:.2f}" for percent in LATENCY_PERCENTILES)
+        latency = f"{percentiles} {values}s over {summary['requests']} requests"
+    lines = [
+        f"{summary['files_per_second']:.2f} files/s, {format_size(summary['bytes_per_second'])}/s "
+        f"({summary['files_uploaded']} files, {format_size(summary['bytes_uploaded'])} uploaded)",
+        f"Latency {latency}, {summary['retries']} retries",
+        f"{summary['check_seconds']:.1f}s checking, {summary['upload_seconds']:.1f}s uploading"
+    ]
+    if 'concurrency' in summary:
+        lines[-1] += f", {summary['concurrency']} uploads at a time"
+    return "\n".join(lines)
+
+def create_session(pool_size=MAX_UPLOAD_WORKERS):
+    """HTTP session for every API call: a keep-alive connection per upload worker, retrying transient errors"""
+    # Imported here so the module loads (and install_requirements runs) before requests is installed
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    from mwclient.client import USER_AGENT as MWCLIENT_USER_AGENT
+    
+    retry_strategy = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=None,  # The API is all POSTs; uploads and queries are safe to send again
+        respect_retry_after_header=True,
+        raise_on_status=False  # Hand the last reply to the response hooks and mwclient instead of raising RetryError
+    )
+    adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=retry_strategy)
+    session = requests.Session()
+    # mwclient only sets its User-Agent on sessions it creates itself, so send the same one here
+    session.headers['User-Agent'] = f"{USER_AGENT} {MWCLIENT_USER_AGENT}"
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def connect(site_url, username, password, pool_size=MAX_UPLOAD_WORKERS):
+    """Log in to the wiki, returning the mwclient site"""
+    import mwclient
+    site = mwclient.Site(site_url, path='/', clients_useragent=USER_AGENT, pool=create_session(pool_size), max_lag=MAXLAG)
+    site.login(username=username, password=password)
+    return site
+
+class UploadEngine:
+    """Checks and uploads files on one wiki without any GUI; progress is reported through callbacks"""
+    def __init__(self, site, site_key, wiki_state=None, log=print,
+                 chunk_threshold=CHUNKED_UPLOAD_THRESHOLD, chunk_size=CHUNK_SIZE):
+        self.site = site
+        self.site_key = site_key  # Key of this wiki in the state cache
+        self.wiki_state = wiki_state or WikiStateCache()
+        self.log = log
+        self.chunk_threshold = chunk_threshold
+        self.chunk_size = chunk_size
+        self.controller = RateController(log=log)
+        self.metrics = UploadMetrics(self.controller)
+        # Every response, retries and lag waits included, tells the controller how the wiki is coping
+        connection = getattr(site, 'connection', None)
+        if connection is not None:
+            connection.hooks['response'].append(self.controller.response_hook)
+            connection.hooks['response'].append(self.metrics.response_hook)
+
+    def check_files_exist(self, filenames, on_batch=None, max_age=None):
+        """Batch check if multiple files exist on the wiki, asking only about files with stale states"""
+        # Fresh states come from the cache
+        results = self.wiki_state.statuses(self.site_key, filenames)
+        to_check = self.wiki_state.stale(self.site_key, filenames, max_age)
+        
+        if to_check:
+            try:
+                for filename, info in query_file_info(self.site, to_check, on_batch, self.controller).items():
+                    if info is not None:
+                        results[filename] = info is not False
+                        self.wiki_state.update(self.site_key, filename, results[filename], info or None)
+            except Exception as e:
+                # On error, fall back to the remembered (possibly stale) states
+                self.log(f"Error checking file statuses on the wiki: {str(e)}")
+            self.wiki_state.save_if_due()
+        
+        return results
+
+    def is_identical(self, file_path):
+        """Whether the wiki already has exactly the bytes of this file"""
+        return self.wiki_state.is_identical(self.site_key, file_path)
+
+    def upload_file(self, file_path, settings):
+        """Upload a single file, returning its outcome: uploaded, skipped, unknown (skipped unchecked), failed or dry_run"""
+        filename = file_path.name
+        try:
+            # Check if file already exists, reusing the status from the last check
+            exists = self.check_files_exist([filename])[filename]
+            if exists:
+                if settings['existing_files'] == "skip":
+                    self.log(f"Skipped {filename} (already exists)")
+                    return "skipped"
+                elif settings['existing_files'] == "update":
+                    # File will be overwritten, handled by ignore=True in upload, unless it wouldn't change anything
+                    if self.is_identical(file_path):
+                        self.log(f"Skipped {filename} (identical to the wiki version)")
+                        return "skipped"
+            elif exists is None and settings['unknown_files'] == "skip":
+                self.log(f"Skipped {filename} (unknown status)")
+                return "unknown"
+            
+            if settings.get('dry_run'):
+                self.log(f"Would upload {filename}")
+                return "dry_run"
+            
+            # Create description with optional additional text
+            description = f"Uploading file: {filename[:-4]}"
+            if settings['description']:
+                description += f" - {settings['description']}"
+            
+            ignore = settings['existing_files'] == "update"
+            file_size = file_path.stat().st_size
+            # Only the upload itself holds a rate controller slot; the status check above takes its own
+            with self.controller:
+                if file_size > self.chunk_threshold:
+                    self.log(f"Uploading {filename} in {-(-file_size // self.chunk_size)} chunks")
+                    result = chunked_upload(
+                        self.site, file_path, filename, description, ignore, self.chunk_size, on_retry=self.metrics.record_retry
+                    )
+                else:
+                    # Bytes, not a file handle: mwclient resends the same files after a lag or 5xx reply,
+                    # and a handle would be read out by then. Files this small fit in memory
+                    result = post_upload(self.site, filename, description, ignore, file=file_path.read_bytes())
+            if not isinstance(result, dict):
+                result = {}
+            if result.get('result') == 'Warning':
+                # Nothing was uploaded (e.g. the file appeared on the wiki meanwhile), so don't remember it as ours
+                self.log(f"Skipped {filename} (wiki warning: {', '.join(result.get('warnings', {}))})")
+                return "skipped"
+            # The upload result usually carries the new imageinfo; otherwise the local file is what the wiki has now
+            info = result.get('imageinfo') or {'sha1': local_sha1(file_path), 'size': file_size}
+            self.wiki_state.update(self.site_key, filename, True, info)
+            # Rewriting the whole cache per upload would make a batch's I/O grow with its square;
+            # it is saved every WIKI_STATE_SAVE_INTERVAL seconds and at the end of the batch
+            self.wiki_state.save_if_due()
+            self.log(f"Successfully uploaded {filename}")
+            return "uploaded"
+        except Exception as e:
+            self.log(f"Error uploading {filename}: {str(e)}")
+            return "failed"
+
+    def upload_and_record(self, file_path, settings, journal):
+        """Upload a single file and append its outcome to the journal"""
+        start = time.monotonic()
+        outcome = self.upload_file(file_path, settings)
+        seconds = time.monotonic() - start
+        try:
+            size = file_path.stat().st_size if outcome == "uploaded" else 0
+        except OSError:
+            size = 0
+        self.metrics.record_file(file_path, outcome, size, seconds)
+        if journal:
+            journal.record(file_path, outcome)
+        return outcome
+
+    def upload_files(self, files, settings, on_progress=None, should_cancel=None, journal=None):
+        """Upload files several at a time, returning how many ended with each outcome
+
+        on_progress(file_path, outcome, done, total) is called in file order from the calling thread.
+        With a journal, files an interrupted batch already finished (and that haven't changed since) are skipped.
+        """
+        counts = dict.fromkeys(OUTCOMES, 0)
+        if settings.get('dry_run'):
+            journal = None  # Nothing is uploaded, so there's nothing to resume
+        self.metrics.reset()
+        check_start = time.monotonic()
+        
+        if journal:
+            finished = journal.begin(self.site_key, settings)
+            resumed = set()
+            for file_path in files:
+                sha1 = finished.get(journal_key(file_path))
+                try:
+                    if sha1 and local_sha1(file_path) == sha1:
+                        resumed.add(file_path)
+                except OSError:
+                    pass
+            if resumed:
+                self.log(f"Resuming an interrupted batch: {len(resumed)} files were already done")
+                files_to_do = [file_path for file_path in files if file_path not in resumed]
+            else:
+                files_to_do = files
+            counts['resumed'] = len(resumed)
+        else:
+            files_to_do = files
+        
+        # Look up every file's status in a few batched queries before the uploads start
+        self.check_files_exist(list(dict.fromkeys(path.name for path in files_to_do)))
+        upload_start = time.monotonic()
+        self.metrics.add_phase_time('check', upload_start - check_start)
+        
+        # Results are collected in file order; only a couple of files per worker are queued,
+        # so cancelling stops after the uploads already in flight. The workers are the ceiling;
+        # the rate controller decides how many of them upload at once
+        workers = settings['workers']
+        self.controller.set_max(workers)
+        remaining = iter(files_to_do)
+        pending = deque()
+        done = counts['resumed']
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upload") as executor:
+                try:
+                    while True:
+                        while not (should_cancel and should_cancel()) and len(pending) < workers * 2:
+                            file_path = next(remaining, None)
+                            if file_path is None:
+                                break
+                            pending.append((file_path, executor.submit(self.upload_and_record, file_path, settings, journal)))
+                        if not pending:
+                            break
+                        
+                        file_path, future = pending.popleft()
+                        if should_cancel and should_cancel() and future.cancel():
+                            continue  # Queued but not started yet
+                        outcome = future.result()
+                        counts[outcome] += 1
+                        done += 1
+                        if on_progress:
+                            on_progress(file_path, outcome, done, len(files))
+                except BaseException:
+                    # Don't start the queued uploads on the way out (e.g. Ctrl+C on the command line)
+                    for _, future in pending:
+                        future.cancel()
+                    raise
+        except BaseException:
+            if journal:
+                journal.close()  # Left incomplete, so the next batch resumes it
+            raise
+        finally:
+            self.wiki_state.save()
+            self.metrics.add_phase_time('upload', time.monotonic() - upload_start)
+            self.metrics.finish()
+        
+        if journal:
+            if should_cancel and should_cancel():
+                journal.close()
+            else:
+                journal.finish()
+        return counts
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Upload a directory of files to the HoH2 wiki without the GUI.")
+    parser.add_argument("directory", type=Path, help="directory of files to upload (subdirectories included)")
+    parser.add_argument("--site", default=DEFAULT_SITE, help=f"wiki to upload to (default: {DEFAULT_SITE})")
+    parser.add_argument("--mode", choices=["skip", "update"], default="skip",
+                        help="what to do with files that already exist on the wiki (default: skip)")
+    parser.add_argument("--unknown", choices=["skip", "upload"], default="skip",
+                        help="what to do with files whose status couldn't be checked (default: skip)")
+    parser.add_argument("--workers", type=int, default=UPLOAD_WORKERS,
+                        help=f"uploads in flight at once, 1-{MAX_UPLOAD_WORKERS} (default: {UPLOAD_WORKERS})")
+    parser.add_argument("--description", default="", help="text added to every upload description")
+    parser.add_argument("--dry-run", action="store_true", help="check the files and report what would be uploaded, without uploading")
+    parser.add_argument("--revalidate", action="store_true", help="check every file on the wiki again instead of trusting the state cache")
+    parser.add_argument("--no-resume", action="store_true", help="start a new batch even if the last one was interrupted")
+    parser.add_argument("--metrics-out", type=Path,
+                        help="write the batch's throughput and latency metrics to this .json or .csv file")
+    parser.add_argument("--chunk-threshold", type=float, default=CHUNKED_UPLOAD_THRESHOLD / (1 << 20),
+                        help=f"upload files larger than this many MiB in chunks (default: {CHUNKED_UPLOAD_THRESHOLD / (1 << 20):g})")
+    parser.add_argument("--chunk-size", type=float, default=CHUNK_SIZE / (1 << 20),
+                        help=f"MiB sent per chunk (default: {CHUNK_SIZE / (1 << 20):g})")
+    parser.add_argument("--username", default=os.environ.get(USERNAME_ENV),
+                        help=f"wiki username (default: ${USERNAME_ENV})")
+    parser.add_argument("--password", default=os.environ.get(PASSWORD_ENV),
+                        help=f"wiki password (default: ${PASSWORD_ENV}; prefer the environment variable over this option)")
+    args = parser.parse_args()
+    if not args.username or not args.password:
+        parser.error(f"a username and password are required, via --username/--password or ${USERNAME_ENV}/${PASSWORD_ENV}")
+    if not args.directory.is_dir():
+        parser.error(f"{args.directory} is not a directory")
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+    args.workers = min(max(1, args.workers), MAX_UPLOAD_WORKERS)
+    return args
+
+def main():
+    args = parse_args()
+    files = list_files(args.directory)
+    if not files:
+        print(f"No files found in {args.directory}")
+        return
+    
+    try:
+        site = connect(args.site, args.username, args.password, args.workers)
+    except Exception as e:
+        print(f"Failed to connect to the wiki: {str(e)}")
+        sys.exit(1)
+    print(f"Logged in to {args.site} as {args.username}")
+    
+    engine = UploadEngine(
+        site, args.site,
+        chunk_threshold=int(args.chunk_threshold * (1 << 20)), chunk_size=max(1, int(args.chunk_size * (1 << 20)))
+    )
+    if args.revalidate:
+        engine.check_files_exist(list(dict.fromkeys(path.name for path in files)), max_age=0)
+    
+    settings = {
+        'existing_files': args.mode,
+        'unknown_files': args.unknown,
+        'description': args.description.strip(),
+        'workers': args.workers,
+        'dry_run': args.dry_run
+    }
+    try:
+        counts = engine.upload_files(files, settings, journal=UploadJournal(resume=not args.no_resume))
+    except KeyboardInterrupt:
+        print("Upload cancelled")
+        counts = None
+    
+    print(format_metrics(engine.metrics.summary()))
+    if args.metrics_out:
+        engine.metrics.export(args.metrics_out)
+        print(f"Metrics saved to {args.metrics_out}")
+    if counts is None:
+        sys.exit(130)
+    
+    if args.dry_run:
+        print(f"Dry run: {counts['dry_run']} of {len(files)} files would be uploaded, {counts['skipped']} skipped, {counts['failed']} failed.")
+    else:
+        print(f"Uploaded {counts['uploaded']} of {len(files)} files, {counts['skipped']} skipped, {counts['failed']} failed.")
+        if counts['resumed']:
+            print(f"{counts['resumed']} files were already done by the interrupted batch.")
+    if counts['unknown']:
+        print(f"{counts['unknown']} files were skipped because their status couldn't be checked.")
+    if counts['failed']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    install_requirements()
+    main()